@@ -0,0 +1,80 @@
+import os
+
+import pygame
+
+# 项目根目录：所有资源路径都相对于这里解析，与启动时的工作目录无关
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+# 存档目录（最高分等）的环境变量，默认写在项目根目录；基准测试会指向临时目录
+DATA_DIR_ENV = "GAME_DEMO_DATA_DIR"
+
+
+def data_path(name):
+    """存档文件的路径：环境变量 GAME_DEMO_DATA_DIR 指定的目录，没有设置时为项目根目录"""
+    return os.path.join(os.environ.get(DATA_DIR_ENV) or ROOT_DIR, name)
+
+
+# 资源管理器
+class AssetManager:
+    """图片资源管理器。
+
+    - 路径相对于 base_dir 解析，不依赖当前工作目录
+    - 第一次使用时才加载图片
+    - 显示窗口创建后把图片转换成屏幕像素格式（convert/convert_alpha），
+      避免每次 blit 都做像素格式转换
+    - 按 (路径, 尺寸) 缓存缩放后的图片
+    """
+
+    def __init__(self, base_dir=ROOT_DIR):
+        self.base_dir = base_dir
+        self.originals = {}  # 路径 -> 原始尺寸图片
+        self.images = {}  # (路径, 尺寸) -> 图片
+
+    def path(self, relative_path):
+        if os.path.isabs(relative_path):
+            return relative_path
+        return os.path.join(self.base_dir, relative_path)
+
+    def exists(self, relative_path):
+        return os.path.exists(self.path(relative_path))
+
+    def image(self, relative_path, size=None):
+        """返回图片，size 为 (宽, 高) 时返回缩放后的版本。找不到文件时抛出 FileNotFoundError"""
+        key = (relative_path, tuple(size) if size else None)
+        image = self.images.get(key)
+        if image is not None:
+            return image
+
+        original = self.originals.get(relative_path)
+        if original is None:
+            original = pygame.image.load(self.path(relative_path))
+            converted = self._convert(original)
+            if converted is None:
+                # 窗口还没创建，先返回未转换的图片，不放进缓存
+                return pygame.transform.scale(original, size) if size else original
+            original = converted
+            self.originals[relative_path] = original
+
+        image = pygame.transform.scale(original, size) if size else original
+        self.images[key] = image
+        return image
+
+    def _convert(self, surface):
+        if pygame.display.get_surface() is None:
+            return None
+        if surface.get_flags() & pygame.SRCALPHA:
+            return surface.convert_alpha()
+        return surface.convert()
+
+    def total_bytes(self):
+        """缓存中所有图片占用的像素内存（字节）"""
+        surfaces = {id(s): s for s in self.originals.values()}
+        surfaces.update((id(s), s) for s in self.images.values())
+        return sum(s.get_pitch() * s.get_height() for s in surfaces.values())
+
+    def clear(self):
+        self.originals.clear()
+        self.images.clear()
+
+
+# 所有游戏共享的资源管理器
+assets = AssetManager()
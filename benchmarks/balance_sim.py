@@ -0,0 +1,220 @@
+"""game4 数值平衡蒙特卡洛模拟。
+
+不开窗口地完整跑很多局 game4：每层按生成器的布局刷怪，玩家按固定脚本
+（ScriptedPolicy）换装备、吃道具、加天赋、逐个打完怪物并拿宝箱，然后下楼，
+直到阵亡或到达 --max-floor。战斗用 BattleEngine，掉落用 roll_battle_rewards，
+和游戏里是同一套逻辑，改了怪物倍率、装备数值或掉率后可以在合并前先跑一遍。
+
+多局分批交给 multiprocessing 进程池，每批返回直方图，主进程边收边合并，
+每 --report-every 批向 stderr 输出一行当前的汇总 JSON，全部跑完后输出最终结果：
+到达楼层、每场战斗回合数、离开每层时的剩余体力（百分比，按 10% 分桶）。
+
+每局的种子由 (--seed, 局序号) 算出，结果与进程数和调度顺序无关。
+
+    python benchmarks/balance_sim.py --runs 10000
+    python benchmarks/balance_sim.py --runs 50000 --workers 8 --output balance.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import Counter
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from game4.constants import MAP_COLS, MAP_ROWS  # noqa: E402
+from game4.entities.equipment import Equipment  # noqa: E402
+from game4.entities.monster import Monster  # noqa: E402
+from game4.entities.player import Player  # noqa: E402
+from game4.enums import EquipmentType, MonsterType, SkillType  # noqa: E402
+from game4.systems.battle_engine import BattleEngine, BattleAction  # noqa: E402
+from game4.systems.floor_generator import generate_floor  # noqa: E402
+from game4.systems.skill_registry import SKILLS  # noqa: E402
+from game4.utils.helpers import roll_battle_rewards  # noqa: E402
+from game4.utils.rng import RNGService, STREAM_BATTLE, STREAM_EQUIPMENT, STREAM_REWARDS, derive_seed  # noqa: E402
+
+SEED = 12345
+MAX_FLOOR = 30
+MAX_FIGHT_TURNS = 200  # 超过就判负，防止打不动的战斗死循环
+HEALTH_BUCKET = 10  # 剩余体力直方图的分桶宽度（百分比）
+EQUIPMENT_CHOICES = 5  # 和装备菜单一样，每个部位每次给 5 件候选
+
+
+class ScriptedPolicy:
+    """固定的玩家策略，尽量贴近一个认真但不算计的玩家。
+
+    - 每层开始时每个部位从候选装备里挑攻击+防御最高的一件换上
+    - 天赋点按 攻击、体力、防御 轮流加
+    - 战斗外体力低于 heal_below 时吃道具（先苹果后面包）
+    - 战斗中体力危险时吃道具，对精英和 Boss 先上割裂，技力够就二连击，否则普通攻击
+    """
+
+    TALENT_ORDER = (0, 1, 0, 2)  # 攻击、体力、攻击、防御
+    HEAL_ITEMS = ("苹果", "面包")
+
+    def __init__(self, heal_below=0.5, danger_below=0.3):
+        self.heal_below = heal_below
+        self.danger_below = danger_below
+        self.talents_spent = 0
+
+    def equip(self, player, rng):
+        for part in EquipmentType:
+            candidates = [Equipment(1, part, rng) for _ in range(EQUIPMENT_CHOICES)]
+            current = player.equipped[part]
+            if current is not None:
+                candidates.append(current)
+            best = max(candidates, key=lambda e: (e.attack + e.defense, e.health))
+            if best is not current:
+                player.equip(best)
+
+    def spend_talents(self, player):
+        while player.talent_points > 0:
+            player.upgrade_attribute(self.TALENT_ORDER[self.talents_spent % len(self.TALENT_ORDER)])
+            self.talents_spent += 1
+
+    def heal_item(self, player):
+        for item in self.HEAL_ITEMS:
+            if player.inventory.get(item, 0) > 0:
+                return item
+        return None
+
+    def rest(self, player):
+        """战斗之间用道具回血"""
+        while player.current_health < player.total_health * self.heal_below:
+            item = self.heal_item(player)
+            if item is None:
+                break
+            player.use_item(item)
+        if player.current_energy < SKILLS[SkillType.DOUBLE_ATTACK].cost and player.inventory.get("葡萄酒", 0) > 0:
+            player.use_item("葡萄酒")
+
+    def choose(self, engine):
+        player = engine.player
+        monster = engine.current_monster
+        if player.current_health < player.total_health * self.danger_below:
+            item = self.heal_item(player)
+            if item is not None:
+                return BattleAction.item(item)
+        if monster.type != MonsterType.NORMAL and player.current_energy >= SKILLS[SkillType.BLEED_ATTACK].cost:
+            if SKILLS[SkillType.BLEED_ATTACK].buff[0] not in monster.buffs:
+                return BattleAction.skill(SkillType.BLEED_ATTACK)
+        if player.current_energy >= SKILLS[SkillType.DOUBLE_ATTACK].cost:
+            return BattleAction.skill(SkillType.DOUBLE_ATTACK)
+        return BattleAction.attack()
+
+
+def run_seed(seed, index):
+    return derive_seed(seed, "run", index)
+
+
+def play_run(seed, max_floor=MAX_FLOOR, width=MAP_COLS, height=MAP_ROWS):
+    """跑一局，返回 (到达楼层, 每场战斗回合数列表, 每层离开时剩余体力百分比列表)"""
+    rng = RNGService(seed)
+    player = Player()
+    policy = ScriptedPolicy()
+    fight_turns, exit_health = [], []
+
+    for floor in range(1, max_floor + 1):
+        layout = generate_floor(seed, floor, width, height)
+        policy.equip(player, rng.stream(STREAM_EQUIPMENT))
+
+        # 从入口由近及远打怪，和玩家沿走廊推进的顺序大致相同
+        ex, ey = layout.entrance
+        spawns = sorted(layout.spawns, key=lambda spawn: abs(spawn[1][0] - ex) + abs(spawn[1][1] - ey))
+        for monster_type, _ in spawns:
+            policy.spend_talents(player)
+            policy.rest(player)
+
+            engine = BattleEngine(player, [Monster(monster_type, floor)], rng=rng.stream(STREAM_BATTLE))
+            turns = 0
+            while engine.result is None and turns < MAX_FIGHT_TURNS:
+                engine.step(policy.choose(engine))
+                turns += 1
+            fight_turns.append(turns)
+            if engine.result != "victory":
+                return floor, fight_turns, exit_health
+
+            player.gain_talent_point()
+            for item in roll_battle_rewards(rng.stream(STREAM_REWARDS)):
+                player.add_item(item, 1)
+
+        # 隐藏房间的宝箱
+        for _ in layout.treasures:
+            player.add_item("面包", 1)
+            player.add_item("葡萄酒", 1)
+        exit_health.append(player.current_health * 100 // player.total_health)
+
+    return max_floor, fight_turns, exit_health
+
+
+def play_batch(args):
+    """进程池任务：跑 [start, start+count) 这几局，返回三个直方图"""
+    seed, start, count, max_floor = args
+    floors, turns, health = Counter(), Counter(), Counter()
+    for index in range(start, start + count):
+        floor, fight_turns, exit_health = play_run(run_seed(seed, index), max_floor)
+        floors[floor] += 1
+        turns.update(fight_turns)
+        health.update(min(h // HEALTH_BUCKET * HEALTH_BUCKET, 100 - HEALTH_BUCKET) for h in exit_health)
+    return count, floors, turns, health
+
+
+def summarize(runs, floors, turns, health, elapsed):
+    def histogram(counter):
+        return {str(key): counter[key] for key in sorted(counter)}
+
+    fights = sum(turns.values())
+    return {
+        "runs": runs,
+        "elapsed_s": round(elapsed, 2),
+        "runs_per_minute": round(runs / elapsed * 60) if elapsed else 0,
+        "mean_floor": round(sum(f * n for f, n in floors.items()) / runs, 3) if runs else 0,
+        "mean_fight_turns": round(sum(t * n for t, n in turns.items()) / fights, 3) if fights else 0,
+        "floor_reached": histogram(floors),
+        "turns_per_fight": histogram(turns),
+        "exit_health_pct": histogram(health),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="game4 数值平衡蒙特卡洛模拟")
+    parser.add_argument("--runs", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch", type=int, default=50, help="每个进程池任务跑的局数")
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--max-floor", type=int, default=MAX_FLOOR)
+    parser.add_argument("--report-every", type=int, default=20, help="每合并多少批向 stderr 输出一次汇总")
+    parser.add_argument("--output", help="结果 JSON 文件，默认输出到标准输出")
+    args = parser.parse_args(argv)
+
+    tasks = [(args.seed, start, min(args.batch, args.runs - start), args.max_floor)
+             for start in range(0, args.runs, args.batch)]
+    runs, floors, turns, health = 0, Counter(), Counter(), Counter()
+    start_time = time.perf_counter()
+    with multiprocessing.Pool(args.workers) as pool:
+        for batches, (count, batch_floors, batch_turns, batch_health) in enumerate(
+                pool.imap_unordered(play_batch, tasks), 1):
+            runs += count
+            floors.update(batch_floors)
+            turns.update(batch_turns)
+            health.update(batch_health)
+            if batches % args.report_every == 0 and runs < args.runs:
+                partial = summarize(runs, floors, turns, health, time.perf_counter() - start_time)
+                print(json.dumps(partial, ensure_ascii=False), file=sys.stderr, flush=True)
+
+    report = summarize(runs, floors, turns, health, time.perf_counter() - start_time)
+    report.update({"seed": args.seed, "workers": args.workers, "max_floor": args.max_floor,
+                   "python": sys.version.split()[0]})
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
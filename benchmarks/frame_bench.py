@@ -0,0 +1,315 @@
+"""无窗口帧时间基准测试。
+
+在 SDL_VIDEODRIVER=dummy 下依次启动每个游戏，去掉 clock.tick 的帧率限制，
+用固定的脚本输入跑固定帧数，统计各阶段耗时的 p50/p95/p99，结果写成 JSON，
+方便在不同提交之间比较。
+
+    python benchmarks/frame_bench.py --frames 600 --output bench.json
+    python benchmarks/frame_bench.py --games game4 definemaster
+
+每个游戏都分别统计 update 和 draw 两个阶段。game4 包直接驱动 GameManager，
+update 为 handle_events + update；其余脚本把更新和绘制写在同一个循环里，
+以提交画面后第一次往屏幕上画东西（fill、blit 或 pygame.draw）为界把一帧
+切成两段，另外给出 frame（两次提交画面之间的总耗时）。
+每个游戏在独立子进程中运行，避免 pygame 状态和 sys.exit 互相影响；
+存档（最高分）通过 GAME_DEMO_DATA_DIR 写到临时目录，不会覆盖仓库里的文件。
+"""
+import argparse
+import json
+import os
+import random
+import runpy
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+GAMES = {
+    "game4": None,  # 包内的 GameManager，单独处理
+    "game4_legacy": "game4.py",
+    "game3": "game3.py",
+    "eatapple": "eatapple.py",
+    "eatapple2": "eatapple2.py",
+    "definemaster": "definemaster.py",
+    "football": os.path.join("football-game", "football_game.py"),
+}
+
+SEED = 12345
+
+
+class BenchmarkDone(BaseException):
+    """跑满帧数后用来跳出游戏主循环（不会被游戏里的 except Exception 吞掉）"""
+
+
+def percentiles(samples):
+    if not samples:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "mean": 0.0, "max": 0.0}
+    ordered = sorted(samples)
+
+    def rank(p):
+        index = min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))
+        return round(ordered[index], 4)
+
+    return {
+        "p50": rank(50),
+        "p95": rank(95),
+        "p99": rank(99),
+        "mean": round(sum(ordered) / len(ordered), 4),
+        "max": round(ordered[-1], 4),
+    }
+
+
+class ScriptedInput:
+    """确定性的输入序列：方向键轮流按住，定期按回车、打开/关闭菜单"""
+
+    def __init__(self, pygame):
+        self.pygame = pygame
+        self.arrows = [pygame.K_RIGHT, pygame.K_DOWN, pygame.K_LEFT, pygame.K_UP]
+        self.frame = 0
+        self.held = set()
+
+    def events_for_frame(self):
+        pygame = self.pygame
+        frame = self.frame
+        self.frame += 1
+
+        keys = []
+        arrow = self.arrows[(frame // 30) % len(self.arrows)]
+        self.held = {arrow}
+        if frame % 30 == 0:
+            keys.append(arrow)
+        if frame % 97 == 0:
+            keys.append(pygame.K_RETURN)
+        if frame % 211 == 0:
+            keys.append(pygame.K_i)
+        if frame % 211 == 20:
+            keys.append(pygame.K_ESCAPE)
+        return [pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode="", scancode=0) for key in keys]
+
+    def next_key_event(self):
+        """给阻塞式的 pygame.event.wait 用：没有脚本事件时返回 ESC 退出菜单"""
+        events = self.events_for_frame()
+        if events:
+            return events[0]
+        return self.pygame.event.Event(self.pygame.KEYDOWN, key=self.pygame.K_ESCAPE, mod=0, unicode="", scancode=0)
+
+
+class HeldKeys:
+    """模拟 pygame.key.get_pressed() 的返回值"""
+
+    def __init__(self, held):
+        self.held = held
+
+    def __getitem__(self, key):
+        return key in self.held
+
+
+def bench_game_manager(frames):
+    """直接驱动 game4 的 GameManager，分别计时 update 和 draw"""
+    import pygame
+
+    sys.path.insert(0, ROOT_DIR)
+    from game4.constants import SCREEN_WIDTH, SCREEN_HEIGHT, FONT_PATH, FONT_SIZE
+    from game4.systems.game_manager import GameManager
+
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    font_path = FONT_PATH if os.path.exists(FONT_PATH) else None
+    font = pygame.font.Font(font_path, FONT_SIZE)
+
+    script = ScriptedInput(pygame)
+    pygame.key.get_pressed = lambda: HeldKeys(script.held)
+
+    game = GameManager(screen, font)
+    dt = 1000 / 60
+    update_times, draw_times = [], []
+    for _ in range(frames):
+        for event in script.events_for_frame():
+            pygame.event.post(event)
+
+        start = time.perf_counter()
+        if not game.handle_events():
+            break
+        game.update(dt)
+        middle = time.perf_counter()
+        game.draw()
+        end = time.perf_counter()
+
+        update_times.append((middle - start) * 1000)
+        draw_times.append((end - middle) * 1000)
+
+    pygame.quit()
+    return {
+        "frames": len(draw_times),
+        "phases": {"update": percentiles(update_times), "draw": percentiles(draw_times)},
+    }
+
+
+def bench_script(path, frames):
+    """运行一个脚本式游戏：替换时钟、输入和画面提交函数，按第一次绘制切分 update 和 draw"""
+    import pygame
+
+    script = ScriptedInput(pygame)
+    frame_times, update_times, draw_times = [], [], []
+    state = {"last": None, "draw_start": None, "screen": None}
+
+    original_get = pygame.event.get
+    original_flip = pygame.display.flip
+    original_update = pygame.display.update
+    original_set_mode = pygame.display.set_mode
+
+    def mark_draw():
+        if state["draw_start"] is None:
+            state["draw_start"] = time.perf_counter()
+
+    class TimedScreen(pygame.Surface):
+        """替代显示表面的离屏表面：第一次绘制时记下 draw 阶段的开始，提交画面时复制到真正的窗口"""
+
+        def fill(self, *args, **kwargs):
+            mark_draw()
+            return super().fill(*args, **kwargs)
+
+        def blit(self, *args, **kwargs):
+            mark_draw()
+            return super().blit(*args, **kwargs)
+
+        def blits(self, *args, **kwargs):
+            mark_draw()
+            return super().blits(*args, **kwargs)
+
+    def timed_set_mode(*args, **kwargs):
+        display = original_set_mode(*args, **kwargs)
+        state["screen"] = TimedScreen(display.get_size(), 0, display)
+        return state["screen"]
+
+    def timed_draw(function):
+        def wrapper(surface, *args, **kwargs):
+            if surface is state["screen"]:
+                mark_draw()
+            return function(surface, *args, **kwargs)
+
+        return wrapper
+
+    def scripted_get(*args, **kwargs):
+        original_get()  # 清空真实事件队列
+        return script.events_for_frame()
+
+    def scripted_wait(*args, **kwargs):
+        original_get()
+        return script.next_key_event()
+
+    def timed_present(present):
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            draw_start = state["draw_start"] if state["draw_start"] is not None else start
+            if state["screen"] is not None:
+                original_get_surface().blit(state["screen"], (0, 0))
+            result = present(*args, **kwargs)
+            end = time.perf_counter()
+            if state["last"] is not None:
+                frame_times.append((end - state["last"]) * 1000)
+                update_times.append((draw_start - state["last"]) * 1000)
+                draw_times.append((end - draw_start) * 1000)
+            state["last"] = end
+            state["draw_start"] = None
+            if len(frame_times) >= frames:
+                raise BenchmarkDone()
+            return result
+
+        return wrapper
+
+    class UncappedClock:
+        def tick(self, framerate=0):
+            return 1000 // 60
+
+        def get_fps(self):
+            return 0.0
+
+    original_get_surface = pygame.display.get_surface
+    pygame.event.get = scripted_get
+    pygame.event.wait = scripted_wait
+    pygame.key.get_pressed = lambda: HeldKeys(script.held)
+    pygame.display.set_mode = timed_set_mode
+    pygame.display.get_surface = lambda: state["screen"]
+    pygame.display.flip = timed_present(original_flip)
+    pygame.display.update = timed_present(original_update)
+    for name in ("rect", "circle", "ellipse", "line", "lines", "polygon", "arc", "aaline", "aalines"):
+        setattr(pygame.draw, name, timed_draw(getattr(pygame.draw, name)))
+    pygame.time.Clock = UncappedClock
+    pygame.time.wait = lambda ms: 0
+    pygame.time.delay = lambda ms: 0
+
+    script_path = os.path.join(ROOT_DIR, path)
+    sys.path.insert(0, os.path.dirname(script_path))
+    sys.argv = [script_path]
+    try:
+        runpy.run_path(script_path, run_name="__main__")
+    except (BenchmarkDone, SystemExit):
+        pass
+
+    return {
+        "frames": len(frame_times),
+        "phases": {"update": percentiles(update_times), "draw": percentiles(draw_times),
+                   "frame": percentiles(frame_times)},
+    }
+
+
+def run_child(game, frames):
+    random.seed(SEED)
+    if GAMES[game] is None:
+        result = bench_game_manager(frames)
+    else:
+        result = bench_script(GAMES[game], frames)
+    print(json.dumps(result))
+
+
+def run_all(games, frames):
+    results = {}
+    # 脚本会写最高分文件：相对路径的写在当前目录，其余的写在 GAME_DEMO_DATA_DIR，都指向临时目录
+    with tempfile.TemporaryDirectory() as workdir:
+        env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1",
+                   GAME_DEMO_DATA_DIR=workdir)
+        for game in games:
+            process = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--child", game, "--frames", str(frames)],
+                cwd=workdir, env=env, capture_output=True, text=True,
+            )
+            lines = process.stdout.strip().splitlines()
+            try:
+                results[game] = json.loads(lines[-1])
+            except (IndexError, ValueError):
+                results[game] = {"error": process.stderr.strip().splitlines()[-1:] or ["no output"]}
+            print(f"{game}: {json.dumps(results[game].get('phases', results[game]))}", file=sys.stderr)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="无窗口帧时间基准测试")
+    parser.add_argument("--frames", type=int, default=600, help="每个游戏运行的帧数")
+    parser.add_argument("--games", nargs="+", choices=sorted(GAMES), default=sorted(GAMES))
+    parser.add_argument("--output", help="结果 JSON 文件，默认输出到标准输出")
+    parser.add_argument("--child", choices=sorted(GAMES), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        run_child(args.child, args.frames)
+        return
+
+    report = {
+        "frames": args.frames,
+        "seed": SEED,
+        "python": sys.version.split()[0],
+        "games": run_all(args.games, args.frames),
+    }
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
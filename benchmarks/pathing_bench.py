@@ -0,0 +1,110 @@
+"""怪物追击寻路基准测试。
+
+在 200×200 的生成楼层上放 500 只怪物，玩家随机走动（走到怪物身上算作
+打完一场战斗，怪物移除），每一步：重算玩家位置的距离场（field），然后让
+仇恨范围内的怪物各走一步（step）。
+分别统计限定仇恨范围和整张地图 BFS 两种距离场的耗时，结果输出为 JSON。
+
+    python benchmarks/pathing_bench.py
+    python benchmarks/pathing_bench.py --monsters 1000 --steps 500
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from frame_bench import percentiles  # noqa: E402
+from game4.constants import MONSTER_AGGRO_RANGE  # noqa: E402
+from game4.entities.monster import Monster  # noqa: E402
+from game4.enums import MonsterType  # noqa: E402
+from game4.systems.floor_generator import generate_floor  # noqa: E402
+from game4.systems.occupancy import OccupancyGrid  # noqa: E402
+from game4.systems.pathing import DistanceField  # noqa: E402
+
+SEED = 12345
+
+
+def run(size, monster_count, steps, max_distance):
+    rng = random.Random(SEED)
+    layout = generate_floor(SEED, 1, size, size)
+    open_cells = sorted({(x, y) for x in range(size) for y in range(size)} - layout.walls)
+
+    occupancy = OccupancyGrid(size, size)
+    player = layout.entrance
+    for x, y in rng.sample([cell for cell in open_cells if cell != player], monster_count):
+        occupancy.place(Monster(MonsterType.NORMAL, 1), x, y)
+
+    field = DistanceField(size, size, layout.walls, max_distance)
+    reach = max_distance if max_distance is not None else size
+    field_times, step_times, moved, battles = [], [], 0, 0
+    for _ in range(steps):
+        # 玩家随机走一步（撞墙就原地不动）
+        x, y = player
+        nx, ny = rng.choice(((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)))
+        if 0 <= nx < size and 0 <= ny < size and not layout.is_blocked(nx, ny):
+            player = (nx, ny)
+            monster = occupancy.get(nx, ny)
+            if monster is not None:
+                occupancy.remove(monster)
+                battles += 1
+
+        start = time.perf_counter()
+        field.update(player)
+        middle = time.perf_counter()
+        px, py = player
+        for monster in occupancy.monsters_in(px - reach, py - reach, px + reach + 1, py + reach + 1):
+            step = field.next_step(monster.x, monster.y, occupancy.is_free)
+            if step == player:
+                occupancy.remove(monster)
+                battles += 1
+            elif step is not None:
+                occupancy.move(monster, *step)
+                moved += 1
+        end = time.perf_counter()
+
+        field_times.append((middle - start) * 1000)
+        step_times.append((end - middle) * 1000)
+
+    return {
+        "max_distance": max_distance,
+        "recomputes": field.recomputes,
+        "monster_moves": moved,
+        "battles": battles,
+        "phases": {"field": percentiles(field_times), "step": percentiles(step_times)},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="怪物追击寻路基准测试")
+    parser.add_argument("--size", type=int, default=200, help="地图边长（格）")
+    parser.add_argument("--monsters", type=int, default=500)
+    parser.add_argument("--steps", type=int, default=300, help="玩家移动步数")
+    parser.add_argument("--output", help="结果 JSON 文件，默认输出到标准输出")
+    args = parser.parse_args(argv)
+
+    report = {
+        "size": args.size,
+        "monsters": args.monsters,
+        "steps": args.steps,
+        "seed": SEED,
+        "python": sys.version.split()[0],
+        "runs": {
+            "aggro_range": run(args.size, args.monsters, args.steps, MONSTER_AGGRO_RANGE),
+            "full_map": run(args.size, args.monsters, args.steps, None),
+        },
+    }
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
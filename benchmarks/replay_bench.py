@@ -0,0 +1,88 @@
+"""录像回放基准测试 / 回归检查。
+
+把 game4 用 --record=文件 录下的一局在 SDL_VIDEODRIVER=dummy 下不限帧率地
+回放，每隔一段帧数比对状态哈希，不一致时报告出错的帧并以非零状态退出。
+默认只跑游戏逻辑（handle_events + update），--draw 时连同绘制一起计时。
+
+    python -m game4.main --seed=42 --record=session.replay
+    python benchmarks/replay_bench.py session.replay
+    python benchmarks/replay_bench.py session.replay --draw --output replay.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from frame_bench import percentiles  # noqa: E402
+
+
+def run(path, draw):
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import pygame
+    from game4.constants import SCREEN_WIDTH, SCREEN_HEIGHT, FONT_PATH, FONT_SIZE
+    from game4.systems.game_manager import GameManager
+    from game4.systems.replay import Recording, ReplayInput, ReplayDivergence, replay
+
+    recording = Recording.load(path)
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    font = pygame.font.Font(FONT_PATH if os.path.exists(FONT_PATH) else None, FONT_SIZE)
+    game = GameManager(screen, font, map_size=recording.map_size, seed=recording.seed,
+                       input_source=ReplayInput(recording))
+
+    frame_times = []
+    state = {"last": time.perf_counter()}
+
+    def on_frame(_):
+        now = time.perf_counter()
+        frame_times.append((now - state["last"]) * 1000)
+        state["last"] = now
+
+    start = time.perf_counter()
+    divergence = None
+    try:
+        frames = replay(game, recording, draw=draw, on_frame=on_frame)
+    except ReplayDivergence as e:
+        frames, divergence = e.frame, {"frame": e.frame, "expected": e.expected, "actual": e.actual}
+    elapsed = time.perf_counter() - start
+    game.floor_cache.close()
+    pygame.quit()
+
+    recorded_seconds = sum(frame[0] for frame in recording.frames[:frames]) / 1000
+    return {
+        "frames": frames,
+        "recorded_s": round(recorded_seconds, 2),
+        "elapsed_s": round(elapsed, 3),
+        "speedup": round(recorded_seconds / elapsed, 1) if elapsed else 0,
+        "hash_checks": sum(1 for frame in recording.hashes if frame <= frames),
+        "divergence": divergence,
+        "phases": {"frame": percentiles(frame_times)},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="game4 录像回放基准测试")
+    parser.add_argument("recording", help="--record 录下的文件")
+    parser.add_argument("--draw", action="store_true", help="回放时同时绘制画面")
+    parser.add_argument("--output", help="结果 JSON 文件，默认输出到标准输出")
+    args = parser.parse_args(argv)
+
+    report = {"recording": args.recording, "draw": args.draw, "python": sys.version.split()[0]}
+    report.update(run(args.recording, args.draw))
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+    if report["divergence"] is not None:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -41,6 +41,27 @@ def save_high_scores(high_scores):
         json.dump(high_scores, f)
 
 
+# 字体注册表：每个 (name, size) 只打开一次
+fonts = {}
+
+
+def get_font(name, size):
+    key = (name, size)
+    font = fonts.get(key)
+    if font is None:
+        font = pygame.font.Font(name, size)
+        fonts[key] = font
+    return font
+
+
+# 实体头顶的数值标签：只有数值变化时才重新渲染
+def get_label(entity, value, template="{}"):
+    if entity.label is None or entity.label_value != value:
+        entity.label_value = value
+        entity.label = get_font(None, 24).render(template.format(value), True, BLACK)
+    return entity.label
+
+
 # 添加新分数到最高分列表
 def add_score_to_high_scores(score, high_scores):
     high_scores.append(score)
@@ -61,6 +82,8 @@ class Player:
         self.score = 0
         self.image = pygame.Surface((self.width, self.height))
         self.image.fill(BLUE)
+        self.label = None
+        self.label_value = None
 
     def move(self, dx, dy):
         self.x += dx
@@ -92,6 +115,8 @@ class Monster:
 
         self.image = pygame.Surface((self.width, self.height))
         pygame.draw.circle(self.image, RED, (self.width // 2, self.height // 2), self.width // 2)
+        self.label = None
+        self.label_value = None
 
     def get_rect(self):
         return pygame.Rect(self.x, self.y, self.width, self.height)
@@ -115,6 +140,8 @@ class Treasure:
 
         self.image = pygame.Surface((self.width, self.height))
         self.image.fill(YELLOW)
+        self.label = None
+        self.label_value = None
 
     def get_rect(self):
         return pygame.Rect(self.x, self.y, self.width, self.height)
@@ -143,14 +170,14 @@ def check_collision(rect1, rect2):
 
 # 显示游戏结束画面
 def show_game_over(screen, score, high_scores):
-    font = pygame.font.Font(None, 74)
+    font = get_font(None, 74)
     text = font.render("Game Over", True, RED)
     screen.blit(text, (SCREEN_WIDTH // 2 - text.get_width() // 2, SCREEN_HEIGHT // 2 - 100))
 
     score_text = font.render(f"Score: {score}", True, BLACK)
     screen.blit(score_text, (SCREEN_WIDTH // 2 - score_text.get_width() // 2, SCREEN_HEIGHT // 2))
 
-    font = pygame.font.Font(None, 36)
+    font = get_font(None, 36)
     text = font.render("Press Enter to play again", True, BLACK)
     screen.blit(text, (SCREEN_WIDTH // 2 - text.get_width() // 2, SCREEN_HEIGHT // 2 + 50))
 
@@ -210,7 +237,7 @@ def show_ability_menu(screen, player, monsters, wave):
         show_menu(screen, menu_items, selected_index, "Ability Menu")
 
         # 显示玩家信息
-        font = pygame.font.Font(None, 28)
+        font = get_font(None, 28)
         power_text = font.render(f"Player Power: {player.power}", True, BLACK)
         score_text = font.render(f"Score: {player.score}", True, BLACK)
         screen.blit(power_text, (SCREEN_WIDTH // 2 - 140, SCREEN_HEIGHT // 2 - 80))
@@ -264,24 +291,21 @@ def main_game():
 
             # 显示玩家
             screen.blit(player.image, (player.x, player.y))
-            power_text = pygame.font.Font(None, 24).render(f"{player.power}", True, BLACK)
-            screen.blit(power_text, (player.x, player.y - 20))
+            screen.blit(get_label(player, player.power), (player.x, player.y - 20))
 
             # 显示怪物
             for monster in monsters:
                 screen.blit(monster.image, (monster.x, monster.y))
-                power_text = pygame.font.Font(None, 24).render(f"{monster.power}", True, BLACK)
-                screen.blit(power_text, (monster.x, monster.y - 20))
+                screen.blit(get_label(monster, monster.power), (monster.x, monster.y - 20))
 
             # 显示宝物
             for treasure in treasures:
                 screen.blit(treasure.image, (treasure.x, treasure.y))
-                value_text = pygame.font.Font(None, 24).render(
-                    f"+{treasure.value}" if treasure.type == "add" else "x2", True, BLACK)
+                value_text = get_label(treasure, treasure.value, "+{}" if treasure.type == "add" else "x2")
                 screen.blit(value_text, (treasure.x, treasure.y - 20))
 
             # 显示战力和分数
-            info_font = pygame.font.Font(None, 36)
+            info_font = get_font(None, 36)
             screen.blit(info_font.render(f"Power: {player.power}", True, BLACK), (10, 10))
             screen.blit(info_font.render(f"Score: {player.score}", True, BLACK), (10, 40))
             screen.blit(info_font.render(f"Wave: {wave}", True, BLACK), (10, 70))
@@ -386,8 +410,8 @@ def main_game():
                     # 显示玩家信息在菜单顶部
                     screen.fill(WHITE, (SCREEN_WIDTH // 2 - 150, SCREEN_HEIGHT // 2 - 100, 300, 400))
                     show_menu(screen, menu_items, selected_index, "Ability Menu")
-                    power_text = pygame.font.Font(None, 28).render(f"Power: {player.power}", True, BLACK)
-                    score_text = pygame.font.Font(None, 28).render(f"Score: {player.score}", True, BLACK)
+                    power_text = get_font(None, 28).render(f"Power: {player.power}", True, BLACK)
+                    score_text = get_font(None, 28).render(f"Score: {player.score}", True, BLACK)
                     screen.blit(power_text, (SCREEN_WIDTH // 2 - 140, SCREEN_HEIGHT // 2 - 90))
                     screen.blit(score_text, (SCREEN_WIDTH // 2 - 140, SCREEN_HEIGHT // 2 - 60))
 
@@ -3,6 +3,8 @@ import random
 import time
 import os
 
+from asset_manager import assets, data_path
+
 # 初始化
 pygame.init()
 
@@ -34,10 +36,8 @@ USE_IMAGE = True
 apple_image = None
 if USE_IMAGE:
     try:
-        apple_image = pygame.image.load("apple.png")
-        apple_image = pygame.transform.scale(apple_image, (GRID_SIZE, GRID_SIZE))
-        player_image = pygame.image.load("player.png")
-        player_image = pygame.transform.scale(player_image, (GRID_SIZE*2, GRID_SIZE*2))
+        apple_image = assets.image("apple.png", (GRID_SIZE, GRID_SIZE))
+        player_image = assets.image("player.png", (GRID_SIZE*2, GRID_SIZE*2))
     except FileNotFoundError:
         print("未找到 apple.png，将使用红色矩形替代。")
         USE_IMAGE = False
@@ -109,10 +109,14 @@ class Apple:
         return intersect_area > 0.2 * total_area
 
 
+# 历史最高分文件
+HIGH_SCORE_FILE = data_path("high_scores.txt")
+
+
 # 读取历史最高分
 def load_high_scores():
-    if os.path.exists("high_scores.txt"):
-        with open("high_scores.txt", "r") as f:
+    if os.path.exists(HIGH_SCORE_FILE):
+        with open(HIGH_SCORE_FILE, "r") as f:
             return sorted([int(line.strip()) for line in f.readlines()], reverse=True)
     return []
 
@@ -121,7 +125,7 @@ def save_high_score(score):
     scores = load_high_scores()
     scores.append(score)
     scores = sorted(scores, reverse=True)[:5]
-    with open("high_scores.txt", "w") as f:
+    with open(HIGH_SCORE_FILE, "w") as f:
         for s in scores:
             f.write(f"{s}\n")
 
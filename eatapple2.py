@@ -3,6 +3,8 @@ import random
 import time
 import os
 
+from asset_manager import assets, data_path
+
 # 初始化
 pygame.init()
 
@@ -37,9 +39,8 @@ EAT_FRAME_FILES = ["eat_frame_0.png", "eat_frame_1.png", "eat_frame_2.png", "eat
 
 if USE_IMAGE:
     try:
-        apple_image = pygame.image.load("apple.png")
-        apple_image = pygame.transform.scale(apple_image, (GRID_SIZE, GRID_SIZE))
-        player_image = pygame.image.load("player.png")
+        apple_image = assets.image("apple.png", (GRID_SIZE, GRID_SIZE))
+        player_image = assets.image("player.png")
     except FileNotFoundError as e:
         print(f"未找到图片: {e}, 将使用颜色矩形替代。")
         USE_IMAGE = False
@@ -65,6 +66,11 @@ class Player:
         self.frame_delay = 0.1  # 每帧0.1秒，总共0.3秒动画 (如果3帧)
         # --------------------
 
+        # --- 按尺寸缓存缩放后的图片 ---
+        self.sprite_cache = {}  # 边长 -> (静止图片, [动画帧...])
+        self.prewarm_sprites()
+        # --------------------
+
     def move(self):
         if self.direction == "UP":
             self.y -= self.base_speed * self.speed_factor
@@ -89,23 +95,49 @@ class Player:
 
     def draw(self):
         rect = pygame.Rect(int(self.x), int(self.y), self.width(), self.height())
+        idle_image, eat_frames = self.get_sprites()
         # --- 绘制逻辑：优先绘制动画 ---
-        if self.is_eating and self.eat_frames:
-            # 绘制当前动画帧
-            current_image = self.eat_frames[self.current_frame]
-            # 假设动画帧已经正确缩放，或者在这里进行缩放以匹配rect
-            # scaled_frame = pygame.transform.scale(current_image, (rect.width, rect.height))
-            current_image = pygame.transform.scale(current_image, (GRID_SIZE * 2 + self.enlarge_step * 10, GRID_SIZE * 2 + self.enlarge_step * 10))  # 使用固定尺寸缩放
-            screen.blit(current_image, rect.topleft)  # 如果帧尺寸已匹配
-            # screen.blit(scaled_frame, rect.topleft) # 如果需要动态缩放帧
+        if self.is_eating and eat_frames:
+            # 绘制当前动画帧（已按当前尺寸缩放）
+            screen.blit(eat_frames[self.current_frame], rect.topleft)
         else:
             # 绘制原来的图像
-            if USE_IMAGE and self.original_image:
-                screen.blit(pygame.transform.scale(self.original_image, (GRID_SIZE * 2+self.enlarge_step*10, GRID_SIZE * 2+self.enlarge_step*10)), rect)
+            if USE_IMAGE and idle_image:
+                screen.blit(idle_image, rect)
             else:
                 pygame.draw.rect(screen, BLUE, rect)
         # ----------------------------
 
+    # --- 缩放图片缓存 ---
+    def get_sprites(self):
+        """返回当前尺寸的静止图片和动画帧，只在尺寸第一次出现时缩放"""
+        size = self.width()
+        sprites = self.sprite_cache.get(size)
+        if sprites is None:
+            sprites = self.build_sprites(size)
+            self.sprite_cache[size] = sprites
+        return sprites
+
+    def build_sprites(self, size):
+        # 缩放结果由资源管理器按 (路径, 尺寸) 缓存，已是屏幕像素格式
+        idle_image = None
+        if self.original_image:
+            idle_image = assets.image("player.png", (size, size))
+        eat_frames = [assets.image(frame_file, (size, size)) for frame_file in self.eat_frame_files]
+        return idle_image, eat_frames
+
+    def prewarm_sprites(self, levels=2):
+        """预先缩放当前及接下来几个放大等级的图片"""
+        for step in range(self.enlarge_step, self.enlarge_step + levels + 1):
+            size = GRID_SIZE * 2 + step * 10
+            if size not in self.sprite_cache:
+                self.sprite_cache[size] = self.build_sprites(size)
+
+    def enlarge(self):
+        self.enlarge_step += 1
+        self.prewarm_sprites()
+    # -------------------
+
     def get_rect(self):
         return pygame.Rect(int(self.x), int(self.y), self.width(), self.height())
 
@@ -113,18 +145,20 @@ class Player:
     def load_eat_frames(self):
         """加载吃苹果动画帧"""
         frames = []
+        self.eat_frame_files = []  # 成功加载的帧文件，用于按尺寸缩放
         # 假设你有 eat_frame_0.png, eat_frame_1.png, ... 等帧图片
         # frame_files = ["eat_frame_0.png", "eat_frame_1.png", "eat_frame_2.png"]  # 根据实际情况修改
         frame_files = EAT_FRAME_FILES  # 使用全局定义的列表
 
         for frame_file in frame_files:
-            if os.path.exists(frame_file):
+            if assets.exists(frame_file):
                 try:
-                    frame = pygame.image.load(frame_file).convert_alpha()
+                    frame = assets.image(frame_file)
                     # 假设动画帧需要缩放到和玩家当前尺寸一致
                     # frame = pygame.transform.scale(frame, (self.width(), self.height()))
                     # 或者如果动画帧是固定尺寸，例如 50x50:
                     frames.append(frame)
+                    self.eat_frame_files.append(frame_file)
                     print(f"成功加载动画帧: {frame_file}")
                 except pygame.error as e:
                     print(f"加载图片 {frame_file} 时出错: {e}")
@@ -196,10 +230,14 @@ class Apple:
         return intersect_area > 0.2 * total_area
 
 
+# 历史最高分文件
+HIGH_SCORE_FILE = data_path("high_scores.txt")
+
+
 # 读取历史最高分
 def load_high_scores():
-    if os.path.exists("high_scores.txt"):
-        with open("high_scores.txt", "r") as f:
+    if os.path.exists(HIGH_SCORE_FILE):
+        with open(HIGH_SCORE_FILE, "r") as f:
             return sorted([int(line.strip()) for line in f.readlines()], reverse=True)
     return []
 
@@ -209,7 +247,7 @@ def save_high_score(score):
     scores = load_high_scores()
     scores.append(score)
     scores = sorted(scores, reverse=True)[:5]
-    with open("high_scores.txt", "w") as f:
+    with open(HIGH_SCORE_FILE, "w") as f:
         for s in scores:
             f.write(f"{s}\n")
 
@@ -335,7 +373,7 @@ while running:
             elif show_ability_menu and event.key == pygame.K_RETURN:
                 if menu_selection == 0:
                     if score >= 5:
-                        player.enlarge_step += 1
+                        player.enlarge()
                         score -= 5
                         show_ability_menu = False
                         show_menu = False
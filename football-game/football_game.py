@@ -1,7 +1,12 @@
 import pygame
 import sys
+import os
 from pygame.locals import *
 
+# 资源管理器位于项目根目录
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from asset_manager import assets
+
 # 初始化 Pygame
 pygame.init()
 
@@ -13,34 +18,14 @@ SCREEN_HEIGHT = 800
 ICON_SIZE = 40
 CIRCLE_SIZE = 120
 
-# 加载图像
-football_img = pygame.image.load('images/football.png')
-football_img = pygame.transform.scale(football_img, (ICON_SIZE, ICON_SIZE))
-
-red_student_img = pygame.image.load('images/red_student.png')
-red_student_img = pygame.transform.scale(red_student_img, (ICON_SIZE, ICON_SIZE))
-
-yellow_student_img = pygame.image.load('images/yellow_student.png')
-yellow_student_img = pygame.transform.scale(yellow_student_img, (ICON_SIZE, ICON_SIZE))
-
-blue_student_img = pygame.image.load('images/blue_student.png')
-blue_student_img = pygame.transform.scale(blue_student_img, (ICON_SIZE, ICON_SIZE))
-
-green_student_img = pygame.image.load('images/green_student.png')
-green_student_img = pygame.transform.scale(green_student_img, (ICON_SIZE, ICON_SIZE))
-
-
-red_student_wait_img = pygame.image.load('images/red_student_w.png')
-red_student_wait_img = pygame.transform.scale(red_student_wait_img, (ICON_SIZE, ICON_SIZE))
+# 图像（由资源管理器在第一次使用时加载并转换）
+IMAGE_DIR = 'football-game/images/'
+ICON = (ICON_SIZE, ICON_SIZE)
 
-yellow_student_wait_img = pygame.image.load('images/yellow_student_w.png')
-yellow_student_wait_img = pygame.transform.scale(yellow_student_wait_img, (ICON_SIZE, ICON_SIZE))
 
-blue_student_wait_img = pygame.image.load('images/blue_student_w.png')
-blue_student_wait_img = pygame.transform.scale(blue_student_wait_img, (ICON_SIZE, ICON_SIZE))
+def icon(name):
+    return assets.image(IMAGE_DIR + name, ICON)
 
-green_student_wait_img = pygame.image.load('images/green_student_w.png')
-green_student_wait_img = pygame.transform.scale(green_student_wait_img, (ICON_SIZE, ICON_SIZE))
 
 # 颜色
 RED = (255, 0, 0)
@@ -207,7 +192,7 @@ class Student(pygame.sprite.Sprite):
 class Football(pygame.sprite.Sprite):
     def __init__(self, x, y):
         super().__init__()
-        self.image = football_img
+        self.image = icon('football.png')
         self.rect = self.image.get_rect(center=(x, y))
         self.carried_by = None
         self.owner = None
@@ -261,11 +246,11 @@ def restart_game():
     footballs = pygame.sprite.Group(*create_honeycomb_pattern())
 
     # 创建学生对象
-    red_student = Student(1001, red_student_img, red_student_wait_img, SCREEN_WIDTH // 2, SCREEN_HEIGHT - CIRCLE_SIZE, RED,
+    red_student = Student(1001, icon('red_student.png'), icon('red_student_w.png'), SCREEN_WIDTH // 2, SCREEN_HEIGHT - CIRCLE_SIZE, RED,
                           is_player=True)
-    yellow_student = Student(1002, yellow_student_img, yellow_student_wait_img, CIRCLE_SIZE, SCREEN_HEIGHT // 2, YELLOW)
-    blue_student = Student(1003, blue_student_img, blue_student_wait_img, SCREEN_WIDTH // 2, CIRCLE_SIZE, BLUE)
-    green_student = Student(1004, green_student_img, green_student_wait_img, SCREEN_WIDTH - CIRCLE_SIZE, SCREEN_HEIGHT // 2, GREEN)
+    yellow_student = Student(1002, icon('yellow_student.png'), icon('yellow_student_w.png'), CIRCLE_SIZE, SCREEN_HEIGHT // 2, YELLOW)
+    blue_student = Student(1003, icon('blue_student.png'), icon('blue_student_w.png'), SCREEN_WIDTH // 2, CIRCLE_SIZE, BLUE)
+    green_student = Student(1004, icon('green_student.png'), icon('green_student_w.png'), SCREEN_WIDTH - CIRCLE_SIZE, SCREEN_HEIGHT // 2, GREEN)
 
     students = pygame.sprite.Group(red_student, yellow_student, blue_student, green_student)
     player = red_student
@@ -2,6 +2,8 @@ import pygame
 import random
 import sys
 
+from placement import FreeCellSampler
+
 # 初始化 Pygame
 pygame.init()
 
@@ -405,13 +407,13 @@ def spawn_monsters():
     global monsters
     monsters = []
     types = ["normal"]*7 + ["elite"]*2 + ["boss"]
+    # 避免重叠出生点或出口，怪物之间也不重叠
+    mid = GRID_HEIGHT // 2
+    blocked = [(x, y) for x in (0, GRID_WIDTH - 1) for y in range(mid - 1, mid + 2)]
+    placement = FreeCellSampler.from_area(range(GRID_WIDTH), range(GRID_HEIGHT), exclude=blocked)
     for mtype in types:
         m = Monster(FLOOR, mtype)
-        # 避免重叠出生点或出口
-        while (m.x == 0 and abs(m.y - GRID_HEIGHT//2) < 2) or \
-              (m.x == GRID_WIDTH-1 and abs(m.y - GRID_HEIGHT//2) < 2):
-            m.x = random.randint(0, GRID_WIDTH - 1)
-            m.y = random.randint(0, GRID_HEIGHT - 1)
+        m.x, m.y = placement.sample()
         monsters.append(m)
 
 def reset_floor():
@@ -5,6 +5,8 @@ import math
 from enum import Enum
 from collections import defaultdict
 
+from placement import FreeCellSampler
+
 # 初始化pygame
 pygame.init()
 
@@ -1211,6 +1213,8 @@ class Game:
 
     def generate_level(self):
         self.monsters = []
+        # 怪物只放在 x=2..GRID_WIDTH-3 之间，避开玩家入口和出口；相邻怪物至少隔一格
+        self.placement = FreeCellSampler.from_area(range(2, GRID_WIDTH - 2), range(1, GRID_HEIGHT - 1), spacing=2)
         self.player.current_health = self.player.get_total_health()
         self.player.current_energy = self.player.get_total_energy()  # 恢复技力
 
@@ -1237,21 +1241,8 @@ class Game:
         self.player.y = GRID_HEIGHT // 2
 
     def place_monster(self, monster):
-        # 确保怪物不重叠
-        while True:
-            # 避开玩家初始位置和出口位置
-            monster.x = random.randint(2, GRID_WIDTH - 3)
-            monster.y = random.randint(1, GRID_HEIGHT - 2)
-
-            # 检查是否与其他怪物重叠
-            overlap = False
-            for other in self.monsters:
-                if (abs(monster.x - other.x) < 2 and abs(monster.y - other.y) < 2):
-                    overlap = True
-                    break
-
-            if not overlap:
-                break
+        # 从本层剩余的空闲格子中取一个，格子不够时抛出 PlacementError
+        monster.x, monster.y = self.placement.sample()
 
     def check_collision(self, obj1_x, obj1_y, obj1_size, obj2_x, obj2_y, obj2_size):
         # 检查两个矩形是否碰撞（20%重合就算触碰）
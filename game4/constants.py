@@ -11,6 +11,8 @@ GAME_AREA_HEIGHT = SCREEN_HEIGHT - STATUS_BAR_HEIGHT
 GRID_SIZE = 40
 MAP_ROWS = GAME_AREA_HEIGHT // GRID_SIZE
 MAP_COLS = SCREEN_WIDTH // GRID_SIZE
+CHUNK_SIZE = 16  # 地图背景按 16×16 格分块缓存
+MAX_CACHED_CHUNKS = 16  # 最多缓存的地图块数，超过时淘汰最久未显示的块
 
 # 颜色定义
 BLACK = (0, 0, 0)
@@ -26,6 +28,8 @@ BROWN = (139, 69, 19)
 PURPLE = (128, 0, 128)
 # 颜色定义 (如果 constants.py 中没有)
 GRASS_GREEN = (34, 139, 34) # 或者你喜欢的其他草绿色
+WALL_COLOR = BROWN
+TREASURE_COLOR = (255, 215, 0)
 
 # 字体设置
 FONT_PATH = os.path.join(os.path.dirname(__file__), "assets", "fonts", "simhei.ttf")
@@ -41,6 +45,10 @@ NORMAL_MONSTER_COUNT = (7, 10)
 ELITE_MONSTER_COUNT = (2, 3)
 BOSS_MONSTER_COUNT = 1
 
+# 怪物追击参数
+MONSTER_AGGRO_RANGE = 8  # 距离玩家多少步以内的怪物会追过来
+MONSTER_MOVE_INTERVAL = 600  # 怪物每隔多少毫秒走一步
+
 # 战斗界面设置
 BATTLE_LEFT_WIDTH = 600
 BATTLE_RIGHT_WIDTH = 300
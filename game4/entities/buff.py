@@ -1,4 +1,5 @@
-# game4/entities/buff.py
+import heapq
+from collections import namedtuple
 from enum import Enum
 
 class BuffType(Enum):
@@ -7,13 +8,109 @@ class BuffType(Enum):
     BLEED = "割裂"        # 每回合掉血 (通常是 DEBUFF)
     POISON = "中毒"        # 按比例掉血 (通常是 DEBUFF)
 
+# 每回合都要结算效果的类型，其余类型只在到期时处理
+TICKING_BUFF_TYPES = frozenset({BuffType.REGENERATION, BuffType.BLEED, BuffType.POISON})
+
 class Buff:
+    __slots__ = ("buff_type", "value", "duration", "expires_at")
+
     def __init__(self, buff_type: BuffType, value: int, duration: int):
         self.buff_type = buff_type
         self.value = value
         self.duration = duration
-        self.name = buff_type.value
+        self.expires_at = None  # 由 BuffContainer 设置的到期回合
+
+    @property
+    def name(self):
+        return self.buff_type.value
 
 # DEBUFF 本质上是具有负面效果的 Buff 实例。
 # 例如：Buff(BuffType.BLEED, 5, 3) 就是一个 DEBUFF。
-# 可以根据 buff_type 来区分是 BUFF 还是 DEBUFF。
\ No newline at end of file
+# 可以根据 buff_type 来区分是 BUFF 还是 DEBUFF。
+
+# Buff 结算事件：kind 为 "effect"（本回合生效，amount 为实际数值）或 "expire"（效果消失）
+BuffEvent = namedtuple("BuffEvent", ["kind", "buff", "amount"])
+
+
+class BuffContainer:
+    """Player 和 Monster 共用的 Buff 容器。
+
+    按 BuffType 存放，同类型只保留一个，添加/刷新/移除都是 O(1)。
+    容器自己计回合数，每个 Buff 记下到期回合并放进最小堆；tick() 只遍历
+    有每回合效果的 Buff，到期的 Buff 从堆顶弹出。刷新持续时间时旧的堆
+    条目不删除，弹出时发现与 Buff 当前的到期回合不符就跳过。
+    """
+
+    __slots__ = ("_buffs", "_ticking", "_expiry", "turn")
+
+    def __init__(self):
+        self._buffs = {}  # BuffType -> Buff
+        self._ticking = {}  # 有每回合效果的 Buff
+        self._expiry = []  # (到期回合, BuffType.name, BuffType)
+        self.turn = 0
+
+    def add(self, buff: Buff) -> bool:
+        """添加 Buff；已有同类型时把持续时间刷新为两者中较长的。返回是否新增了类型"""
+        existing = self._buffs.get(buff.buff_type)
+        if existing is not None:
+            expires_at = self.turn + buff.duration
+            if expires_at > existing.expires_at:
+                existing.expires_at = expires_at
+                existing.duration = buff.duration
+                self._push(existing)
+            return False
+
+        buff.expires_at = self.turn + buff.duration
+        self._buffs[buff.buff_type] = buff
+        if buff.buff_type in TICKING_BUFF_TYPES:
+            self._ticking[buff.buff_type] = buff
+        self._push(buff)
+        return True
+
+    def _push(self, buff):
+        heapq.heappush(self._expiry, (buff.expires_at, buff.buff_type.name, buff.buff_type))
+
+    def remove(self, buff_type: BuffType):
+        self._ticking.pop(buff_type, None)
+        return self._buffs.pop(buff_type, None)
+
+    def get(self, buff_type: BuffType):
+        return self._buffs.get(buff_type)
+
+    def remaining(self, buff: Buff) -> int:
+        return buff.expires_at - self.turn
+
+    def tick(self):
+        """推进一回合，返回 (本回合生效的 Buff 列表, 到期移除的 Buff 列表)"""
+        self.turn += 1
+        effects = list(self._ticking.values())
+
+        expired = []
+        while self._expiry and self._expiry[0][0] <= self.turn:
+            expires_at, _, buff_type = heapq.heappop(self._expiry)
+            buff = self._buffs.get(buff_type)
+            if buff is not None and buff.expires_at == expires_at:
+                self.remove(buff_type)
+                buff.duration = 0
+                expired.append(buff)
+        return effects, expired
+
+    def active(self):
+        """仍然有效的 Buff，duration 同步为剩余回合数"""
+        for buff in self._buffs.values():
+            buff.duration = buff.expires_at - self.turn
+        return list(self._buffs.values())
+
+    def clear(self):
+        self._buffs.clear()
+        self._ticking.clear()
+        self._expiry = []
+
+    def __contains__(self, buff_type):
+        return buff_type in self._buffs
+
+    def __iter__(self):
+        return iter(list(self._buffs.values()))
+
+    def __len__(self):
+        return len(self._buffs)
@@ -5,10 +5,13 @@ import os
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from ..enums import EquipmentType
+from ..utils.content import equipment_name, equipment_options
 
 
 class Equipment:
-    def __init__(self, floor: int, part: EquipmentType):
+    __slots__ = ("floor", "part", "attack", "health", "defense", "energy")
+
+    def __init__(self, floor: int, part: EquipmentType, rng=random):
         self.floor = floor
         self.part = part
         self.attack = 0
@@ -16,34 +19,18 @@ class Equipment:
         self.defense = 0
         self.energy = 0
 
-        self._generate_stats()
-
-    def _generate_stats(self):
-        f = self.floor
-        if self.part == EquipmentType.HEAD:
-            if random.random() < 0.5:
-                self.defense = f * random.randint(1, 3)
-            else:
-                self.health = f * random.randint(5, 10)
-        elif self.part == EquipmentType.CHEST:
-            self.health = f * random.randint(10, 20)
-        elif self.part == EquipmentType.LEFT_HAND:
-            self.attack = f * random.randint(5, 10)
-        elif self.part == EquipmentType.RIGHT_HAND:
-            self.defense = f * random.randint(2, 5)
-        elif self.part == EquipmentType.FEET:
-            self.defense = f * random.randint(1, 3)
+        self._generate_stats(rng)
+
+    def _generate_stats(self, rng):
+        # 从 data/content.json 的定义中选一个属性组合，数值为 楼层 × 随机倍数
+        options = equipment_options(self.part)
+        option = options[0] if len(options) == 1 else options[int(rng.random() * len(options))]
+        for stat, (low, high) in option.items():
+            setattr(self, stat, self.floor * rng.randint(low, high))
 
     @property
     def name(self):
-        names = {
-            EquipmentType.HEAD: f"{self.floor}号头盔",
-            EquipmentType.CHEST: f"{self.floor}号护甲",
-            EquipmentType.LEFT_HAND: f"{self.floor}号长剑",
-            EquipmentType.RIGHT_HAND: f"{self.floor}号护盾",
-            EquipmentType.FEET: f"{self.floor}号靴子"
-        }
-        return names[self.part]
+        return equipment_name(self.part, self.floor)
 
     def get_stats_string(self):
         stats = []
@@ -7,15 +7,22 @@ from ..enums import ItemType
 
 
 class Item:
+    __slots__ = ("type",)
+
+    # 名称和描述由道具类型决定，所有实例共享
+    DESCRIPTIONS = {
+        ItemType.APPLE: "恢复20点体力",
+        ItemType.BREAD: "恢复当前体力最大值的20%",
+        ItemType.WINE: "恢复20点技力"
+    }
+
     def __init__(self, item_type: ItemType):
         self.type = item_type
-        self.name = item_type.value
-        self.description = self._get_description()
 
-    def _get_description(self):
-        descriptions = {
-            ItemType.APPLE: "恢复20点体力",
-            ItemType.BREAD: "恢复当前体力最大值的20%",
-            ItemType.WINE: "恢复20点技力"
-        }
-        return descriptions[self.type]
\ No newline at end of file
+    @property
+    def name(self):
+        return self.type.value
+
+    @property
+    def description(self):
+        return self.DESCRIPTIONS[self.type]
@@ -7,10 +7,14 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from ..enums import EquipmentType, ItemType
 from .equipment import Equipment
-from .buff import Buff, BuffType
+from .buff import Buff, BuffType, BuffContainer, BuffEvent
 
 
 class Player:
+    __slots__ = ("equipped", "inventory", "base_attack", "base_health", "base_defense", "base_energy",
+                 "buffs", "_stats", "stats_version", "current_health", "current_energy",
+                 "level", "talent_points", "x", "y", "version")
+
     def __init__(self):
         # 装备和道具
         self.equipped: Dict[EquipmentType, Optional[Equipment]] = {
@@ -33,6 +37,13 @@ class Player:
         self.base_defense = 5
         self.base_energy = 50
 
+        # BUFF状态
+        self.buffs = BuffContainer()
+
+        # 总属性缓存 (攻击, 体力, 防御, 技力)，装备/BUFF/天赋变化时失效
+        self._stats = None
+        self.stats_version = 0
+
         # 当前状态
         self.current_health = self.total_health
         self.current_energy = self.total_energy
@@ -41,50 +52,56 @@ class Player:
         self.level = 1
         self.talent_points = 0
 
-        # BUFF状态
-        self.buffs: List[Buff] = []
-
         # 位置
         self.x = 0
         self.y = 0
 
-    @property
-    def total_attack(self):
+        # 道具、装备、天赋点、基础属性每次变化都会递增，菜单据此判断是否需要重建
+        self.version = 0
+
+    def mark_changed(self):
+        self.version += 1
+
+    def invalidate_stats(self):
+        """装备、BUFF 或基础属性变化后调用；stats_version 递增，UI 可据此跳过重绘"""
+        self._stats = None
+        self.stats_version += 1
+
+    def _compute_stats(self):
         attack = self.base_attack
+        health = self.base_health
+        defense = self.base_defense
+        energy = self.base_energy
         for equipment in self.equipped.values():
             if equipment:
                 attack += equipment.attack
+                health += equipment.health
+                defense += equipment.defense
+                energy += equipment.energy
 
         # 应用 Buff 效果
-        for buff in self.buffs:
-            if buff.buff_type == BuffType.STRENGTH:
-                attack += buff.value
+        strength = self.buffs.get(BuffType.STRENGTH)
+        if strength:
+            attack += strength.value
 
-        return attack
+        self._stats = (attack, health, defense, energy)
+        return self._stats
+
+    @property
+    def total_attack(self):
+        return (self._stats or self._compute_stats())[0]
 
     @property
     def total_health(self):
-        health = self.base_health
-        for equipment in self.equipped.values():
-            if equipment:
-                health += equipment.health
-        return health
+        return (self._stats or self._compute_stats())[1]
 
     @property
     def total_defense(self):
-        defense = self.base_defense
-        for equipment in self.equipped.values():
-            if equipment:
-                defense += equipment.defense
-        return defense
+        return (self._stats or self._compute_stats())[2]
 
     @property
     def total_energy(self):
-        energy = self.base_energy
-        for equipment in self.equipped.values():
-            if equipment:
-                energy += equipment.energy
-        return energy
+        return (self._stats or self._compute_stats())[3]
 
     def move(self, dx, dy):
         new_x = self.x + dx
@@ -115,34 +132,39 @@ class Player:
         return False
 
     def add_buff(self, buff: Buff):
-        # 检查是否已有相同类型的buff
-        for existing_buff in self.buffs:
-            if existing_buff.buff_type == buff.buff_type:
-                # 刷新持续时间
-                existing_buff.duration = max(existing_buff.duration, buff.duration)
-                return
-        self.buffs.append(buff)
-
-    def update_buffs(self):
-        # 更新所有buff的持续时间
-        for buff in self.buffs[:]:  # 使用切片复制列表以避免在迭代时修改
-            buff.duration -= 1
-            if buff.duration <= 0:
-                self.buffs.remove(buff)
-
-            # 应用每回合效果
+        # 已有相同类型的buff时只刷新持续时间
+        if self.buffs.add(buff):
+            self.invalidate_stats()
+
+    def update_buffs(self) -> List[BuffEvent]:
+        """推进一回合：结算每回合效果并移除到期的buff，返回结算事件"""
+        effects, expired = self.buffs.tick()
+        events = []
+
+        # 应用每回合效果
+        for buff in effects:
             if buff.buff_type == BuffType.REGENERATION:
+                before = self.current_health
                 self.heal(buff.value)
+                events.append(BuffEvent("effect", buff, self.current_health - before))
             elif buff.buff_type == BuffType.BLEED:
-                self.take_damage(buff.value)
+                events.append(BuffEvent("effect", buff, self.take_damage(buff.value)))
+
+        for buff in expired:
+            events.append(BuffEvent("expire", buff, 0))
+        if expired:
+            self.invalidate_stats()
+        return events
 
     def get_active_buffs(self):
-        return [buff for buff in self.buffs if buff.duration > 0]
+        return self.buffs.active()
 
     def equip(self, equipment: Equipment):
         if equipment.part in self.equipped:
             old_equipment = self.equipped[equipment.part]
             self.equipped[equipment.part] = equipment
+            self.invalidate_stats()
+            self.mark_changed()
             return old_equipment
         return None
 
@@ -150,6 +172,8 @@ class Player:
         if part in self.equipped:
             equipment = self.equipped[part]
             self.equipped[part] = None
+            self.invalidate_stats()
+            self.mark_changed()
             return equipment
         return None
 
@@ -158,10 +182,12 @@ class Player:
             self.inventory[item_type] += quantity
         else:
             self.inventory[item_type] = quantity
+        self.mark_changed()
 
     def use_item(self, item_type: str):
         if item_type in self.inventory and self.inventory[item_type] > 0:
             self.inventory[item_type] -= 1
+            self.mark_changed()
 
             if item_type == "苹果":
                 self.heal(20)
@@ -178,9 +204,35 @@ class Player:
 
     def gain_talent_point(self):
         self.talent_points += 1
+        self.mark_changed()
 
     def spend_talent_point(self):
         if self.talent_points > 0:
             self.talent_points -= 1
+            self.mark_changed()
             return True
-        return False
\ No newline at end of file
+        return False
+
+    def upgrade_attribute(self, index):
+        """消耗1点天赋提升基础属性：0 攻击力、1 体力、2 防御力、3 技力，返回是否成功"""
+        if not self.spend_talent_point():
+            return False
+        if index == 0:  # 攻击力
+            self.base_attack += 3
+        elif index == 1:  # 体力
+            self.base_health += 10
+        elif index == 2:  # 防御力
+            self.base_defense += 1
+        elif index == 3:  # 技力
+            self.base_energy += 3
+        # 基础属性变了，总属性缓存失效
+        self.invalidate_stats()
+
+        if index == 1:
+            # 同步当前血量
+            self.current_health = self.total_health
+        elif index == 3:
+            # 同步当前技力
+            self.current_energy = self.total_energy
+        self.mark_changed()
+        return True
\ No newline at end of file
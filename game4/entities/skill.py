@@ -1,28 +1,63 @@
 # game4/entities/skill.py
 """Skill entity."""
-from game4.enums import SkillType
+from ..enums import SkillType
+from .buff import BuffType
+
+# 技能目标
+TARGET_ENEMY = "enemy"
+TARGET_SELF = "self"
+
+# 技能定义表（菜单按这里的顺序列出技能）
+# cost: 消耗技力; target: 作用对象; hits: 普通攻击次数; hit_suffix: 攻击日志后缀
+# buff: (类型, 数值, 回合数)，数值可以是以玩家为参数的函数
+# buff_log: 施加 buff 后的日志，可用 {target} 和 {value}
+SKILL_DEFINITIONS = {
+    SkillType.DOUBLE_ATTACK: {
+        "name": "二连击",
+        "description": "连续攻击2次",
+        "cost": 10,
+        "target": TARGET_ENEMY,
+        "hits": 2,
+    },
+    SkillType.BLEED_ATTACK: {
+        "name": "割裂",
+        "description": "攻击并施加割裂效果",
+        "cost": 15,
+        "target": TARGET_ENEMY,
+        "hits": 1,
+        "hit_suffix": " (割裂攻击)",
+        "buff": (BuffType.BLEED, 5, 3),  # 3回合，每回合掉5血
+        "buff_log": "对 {target} 施加了割裂效果 (持续3回合)",
+    },
+    SkillType.BATTLE_CRY: {
+        "name": "战吼",
+        "description": "获得强壮BUFF",
+        "cost": 20,
+        "target": TARGET_SELF,
+        # 基础攻击的30%，持续2回合
+        "buff": (BuffType.STRENGTH, lambda player: int(player.base_attack * 0.3), 2),
+        "buff_log": "攻击力提升了 {value} 点! (持续2回合)",
+    },
+    SkillType.BLESS: {
+        "name": "祝福",
+        "description": "获得恢复BUFF",
+        "cost": 25,
+        "target": TARGET_SELF,
+        "buff": (BuffType.REGENERATION, 10, 3),
+        "buff_log": "获得了恢复效果!",
+    },
+}
+
 
 class Skill:
     def __init__(self, skill_type):
+        definition = SKILL_DEFINITIONS[skill_type]
         self.type = skill_type
-        self.name = self.get_name()
-        self.description = self.get_description()
-        self.cost = 5
-
-    def get_name(self):
-        names = {
-            SkillType.DOUBLE_ATTACK: "二连击",
-            SkillType.BLEED_ATTACK: "割裂",
-            SkillType.BATTLE_CRY: "战吼",
-            SkillType.BLESS: "祝福",
-        }
-        return names[self.type]
-
-    def get_description(self):
-        descriptions = {
-            SkillType.DOUBLE_ATTACK: "连续攻击2次",
-            SkillType.BLEED_ATTACK: "攻击并施加割裂效果",
-            SkillType.BATTLE_CRY: "获得强壮BUFF",
-            SkillType.BLESS: "获得恢复BUFF",
-        }
-        return descriptions[self.type]
\ No newline at end of file
+        self.name = definition["name"]
+        self.description = definition["description"]
+        self.cost = definition["cost"]
+        self.target = definition["target"]
+        self.hits = definition.get("hits", 0)
+        self.hit_suffix = definition.get("hit_suffix", "")
+        self.buff = definition.get("buff")
+        self.buff_log = definition.get("buff_log")
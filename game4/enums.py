@@ -36,6 +36,12 @@ class BattleMenuType(Enum):
     SKILL = 2
     ITEM = 3
 
+class SkillType(Enum):
+    DOUBLE_ATTACK = 1
+    BLEED_ATTACK = 2
+    BATTLE_CRY = 3
+    BLESS = 4
+
 class Direction(Enum):
     UP = 1
     DOWN = 2
@@ -0,0 +1,265 @@
+# game4/systems/battle_engine.py
+import random
+from collections import namedtuple
+from typing import List, Optional
+
+from ..entities.player import Player
+from ..entities.monster import Monster
+from ..entities.buff import BuffType
+from ..enums import SkillType
+from ..constants import ESCAPE_SUCCESS_RATE
+from ..utils.helpers import calculate_damage
+from .skill_registry import use_skill
+
+# 行动类型
+ATTACK = "attack"
+SKILL = "skill"
+ITEM = "item"
+ESCAPE = "escape"
+ACTION_KINDS = (ATTACK, SKILL, ITEM, ESCAPE)
+
+
+class BattleAction(namedtuple("BattleAction", ["kind", "arg"])):
+    """玩家的一次战斗行动；arg 为技能类型（SKILL）或道具名（ITEM）"""
+
+    __slots__ = ()
+
+    @classmethod
+    def attack(cls):
+        return cls(ATTACK, None)
+
+    @classmethod
+    def skill(cls, skill_type: SkillType):
+        return cls(SKILL, skill_type)
+
+    @classmethod
+    def item(cls, item_name: str):
+        return cls(ITEM, item_name)
+
+    @classmethod
+    def escape(cls):
+        return cls(ESCAPE, None)
+
+
+# 战斗事件：kind 为 "damage" / "heal" / "buff" / "buff_expire" / "defeated"，actor 为 None 表示 Buff 效果
+BattleEvent = namedtuple("BattleEvent", ["kind", "actor", "target", "amount"])
+
+
+class TurnResult:
+    """一次 act()/monster_turn()/step() 的结果：日志、结构化事件和战斗状态"""
+
+    def __init__(self, action: Optional[BattleAction]):
+        self.action = action
+        self.messages: List[str] = []
+        self.events: List[BattleEvent] = []
+        self.outcome = None  # None, "victory", "defeat", "escape"
+        self.turn_ended = False  # 玩家的回合是否已经用掉
+
+    def total(self, kind, target=None):
+        return sum(e.amount for e in self.events if e.kind == kind and (target is None or e.target is target))
+
+    @property
+    def damage_taken(self):
+        return sum(e.amount for e in self.events if e.kind == "damage" and isinstance(e.target, Player))
+
+    @property
+    def damage_dealt(self):
+        return sum(e.amount for e in self.events if e.kind == "damage" and isinstance(e.target, Monster))
+
+
+class BattleEngine:
+    """不依赖 pygame 的战斗逻辑。
+
+    act() 执行玩家的行动，monster_turn() 执行怪物回合，step() 依次执行两者；
+    都返回 TurnResult。随机数（逃跑判定）来自注入的 rng，便于复现和批量模拟。
+    on_log 为可选的日志回调，BattleSystem 用它把日志写进界面的日志面板。
+    """
+
+    def __init__(self, player: Player, monsters: List[Monster], rng=random, on_log=None):
+        self.player = player
+        self.monsters = monsters
+        self.rng = rng
+        self.on_log = on_log
+        self.current_monster_index = 0
+        self.is_player_turn = True
+        self.result = None  # None, "victory", "defeat", "escape"
+        self.turns = 0
+        self._turn: Optional[TurnResult] = None
+
+        monster_names = [m.type.value for m in monsters]
+        self.add_log(f"遭遇了 {', '.join(monster_names)}!")
+
+    @property
+    def current_monster(self) -> Optional[Monster]:
+        if 0 <= self.current_monster_index < len(self.monsters):
+            return self.monsters[self.current_monster_index]
+        return None
+
+    def add_log(self, message):
+        if self._turn is not None:
+            self._turn.messages.append(message)
+        if self.on_log:
+            self.on_log(message)
+
+    def record(self, kind, actor, target, amount=0):
+        if self._turn is not None:
+            self._turn.events.append(BattleEvent(kind, actor, target, amount))
+
+    def _begin(self, action, result=None) -> TurnResult:
+        self._turn = result if result is not None else TurnResult(action)
+        return self._turn
+
+    def _finish(self) -> TurnResult:
+        result = self._turn
+        result.outcome = self.result
+        result.turn_ended = not self.is_player_turn or self.result is not None
+        self._turn = None
+        return result
+
+    # ---- 对外接口 ----
+
+    def act(self, action: BattleAction) -> TurnResult:
+        """执行玩家的行动；不是玩家回合或战斗已结束时什么也不做"""
+        if action.kind not in ACTION_KINDS:
+            raise ValueError(f"未知的战斗行动: {action.kind}")
+        self._begin(action)
+        if self.result is None and self.is_player_turn:
+            if action.kind == ATTACK:
+                self.player_attack()
+                self.end_player_turn()
+            elif action.kind == SKILL:
+                self.player_use_skill(action.arg)
+                self.end_player_turn()
+            elif action.kind == ITEM:
+                # 道具用不了时不消耗回合
+                if self.player_use_item(action.arg):
+                    self.end_player_turn()
+            elif action.kind == ESCAPE:
+                self.try_escape()
+        return self._finish()
+
+    def monster_turn(self, result: TurnResult = None) -> TurnResult:
+        """怪物回合：结算怪物的 Buff 并攻击，然后把回合交还给玩家"""
+        self._begin(None, result)
+        if self.result is None and not self.is_player_turn:
+            self.turns += 1
+            self.monster_attack()
+            if self.result != "defeat":
+                self.is_player_turn = True
+                self.add_log("你的回合开始了")
+        return self._finish()
+
+    def step(self, action: BattleAction) -> TurnResult:
+        """玩家行动，回合用掉后接着执行怪物回合，返回合并后的结果"""
+        result = self.act(action)
+        if self.result is None and not self.is_player_turn:
+            self.monster_turn(result)
+        return result
+
+    # ---- 战斗逻辑 ----
+
+    def player_attack(self, log_suffix=""):
+        monster = self.current_monster
+        if not monster or not monster.is_alive():
+            return
+
+        damage = calculate_damage(self.player.total_attack, monster.defense)
+        actual_damage = monster.take_damage(damage)
+        self.record("damage", self.player, monster, actual_damage)
+        self.add_log(f"你对 {monster.type.value} 造成了 {actual_damage} 点伤害{log_suffix}")
+
+        if not monster.is_alive():
+            self.record("defeated", self.player, monster)
+            self.add_log(f"{monster.type.value} 被击败了!")
+            self.check_victory()
+
+    def player_use_skill(self, skill_type: SkillType):
+        # 技能效果由 skill_registry 中编译好的定义表决定
+        return use_skill(self, skill_type)
+
+    def player_use_item(self, item_name):
+        before = self.player.current_health
+        success, message = self.player.use_item(item_name)
+        if success and self.player.current_health > before:
+            self.record("heal", self.player, self.player, self.player.current_health - before)
+        self.add_log(message)
+        return success
+
+    def try_escape(self):
+        if self.rng.random() < ESCAPE_SUCCESS_RATE:
+            self.add_log("成功逃跑了!")
+            self.result = "escape"
+        else:
+            self.add_log("逃跑失败!")
+            self.end_player_turn()
+
+    def monster_attack(self):
+        monster = self.current_monster
+        if not monster or not monster.is_alive():
+            return
+
+        # 1. 怪物回合开始时，先更新自身 Buff/Debuff
+        self.update_monster_buffs()
+        if not monster.is_alive():
+            return
+
+        # 2. 然后进行攻击（attack_player 已扣过一次防御，take_damage 会再扣一次）
+        damage = monster.attack_player(self.player)
+        actual_damage = self.player.take_damage(damage)
+        self.record("damage", monster, self.player, actual_damage)
+        self.add_log(f"{monster.type.value} 对你造成了 {actual_damage} 点伤害")
+
+        if self.player.current_health <= 0:
+            self.add_log("你被击败了!")
+            self.result = "defeat"
+
+    def update_monster_buffs(self):
+        """更新当前怪物的 Buff/Debuff 并记录日志"""
+        monster = self.current_monster
+        if not monster:
+            return
+
+        name = monster.type.value
+        for event in monster.update_buffs():
+            if event.kind == "effect" and event.buff.buff_type == BuffType.BLEED:
+                self.record("damage", None, monster, event.amount)
+                self.add_log(f"{name} 受到 {event.amount} 点割裂伤害")
+            elif event.kind == "expire":
+                self.record("buff_expire", None, monster)
+                self.add_log(f"{name} 身上的 {event.buff.name} 效果消失了")
+
+        if not monster.is_alive():
+            self.record("defeated", None, monster)
+            self.add_log(f"{name} 被击败了!")
+            self.check_victory()
+
+    def update_player_buffs(self):
+        """更新玩家的 Buff/Debuff 并记录日志"""
+        for event in self.player.update_buffs():
+            if event.kind == "effect":
+                if event.buff.buff_type == BuffType.REGENERATION:
+                    self.record("heal", None, self.player, event.amount)
+                    self.add_log(f"恢复效果回复了 {event.amount} 点体力")
+                elif event.buff.buff_type == BuffType.BLEED:
+                    self.record("damage", None, self.player, event.amount)
+                    self.add_log(f"你受到 {event.amount} 点割裂伤害")
+            elif event.kind == "expire":
+                self.record("buff_expire", None, self.player)
+                self.add_log(f"你身上的 {event.buff.name} 效果消失了")
+
+    def end_player_turn(self):
+        self.is_player_turn = False
+        # 更新玩家buff
+        self.update_player_buffs()
+
+    def check_victory(self):
+        alive_monsters = [m for m in self.monsters if m.is_alive()]
+        if not alive_monsters:
+            self.add_log("所有敌人都被击败了!")
+            self.result = "victory"
+        else:
+            # 切换到下一个活着的怪物
+            for i, monster in enumerate(self.monsters):
+                if monster.is_alive():
+                    self.current_monster_index = i
+                    break
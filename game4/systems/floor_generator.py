@@ -0,0 +1,268 @@
+# game4/systems/floor_generator.py
+import random
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import FrozenSet, Tuple
+
+from ..constants import NORMAL_MONSTER_COUNT, ELITE_MONSTER_COUNT, BOSS_MONSTER_COUNT
+from ..enums import MonsterType
+from ..utils.rng import derive_seed
+
+Cell = Tuple[int, int]
+
+# 房间尺寸范围（格）
+ROOM_WIDTH = (4, 8)
+ROOM_HEIGHT = (3, 6)
+SECRET_ROOM_SIZE = 3
+SPAWN_SAFE_DISTANCE = 4  # 入口附近不刷怪
+CHAIN_BAND_WIDTH = 16
+FLOOR_CACHE_SIZE = 8
+GENERATION_ATTEMPTS = 8
+# 能稳定放下房间、走廊和一层全部怪物（最多 14 只）的最小地图（列, 行）
+MIN_MAP_SIZE = (16, 12)
+
+
+class FloorGenerationError(ValueError):
+    """地图太小，放不下房间、走廊或这一层的全部怪物"""
+
+
+def floor_seed(run_seed, floor) -> int:
+    """由 (本局种子, 楼层) 得到稳定的楼层种子，不受 Python 哈希随机化影响"""
+    return derive_seed(run_seed, floor)
+
+
+class FloorLayout:
+    """一层地图的布局，生成后不再修改，可以放进缓存并在线程间共享。
+
+    walls 为不可通行的格子；secret_doors 画成墙但可以通过，后面是隐藏房间；
+    treasures 是隐藏房间里的宝箱；spawns 为 (怪物类型, 格子) 列表。
+    """
+
+    def __init__(self, floor, width, height, entrance, exit, rooms, walls, secret_doors, treasures, spawns):
+        self.floor = floor
+        self.width = width
+        self.height = height
+        self.entrance: Cell = entrance
+        self.exit: Cell = exit
+        self.rooms: Tuple[Tuple[int, int, int, int], ...] = rooms
+        self.walls: FrozenSet[Cell] = walls
+        self.secret_doors: FrozenSet[Cell] = secret_doors
+        self.treasures: FrozenSet[Cell] = treasures
+        self.spawns: Tuple[Tuple[MonsterType, Cell], ...] = spawns
+
+    def is_blocked(self, x, y):
+        return (x, y) in self.walls
+
+    @property
+    def wall_tiles(self):
+        """画成墙的格子：真正的墙加上暗门"""
+        return self.walls | self.secret_doors
+
+
+def _room_cells(room):
+    x, y, w, h = room
+    return [(cx, cy) for cx in range(x, x + w) for cy in range(y, y + h)]
+
+
+def _touches(room, cells):
+    """房间（连同一圈边界）是否与已有格子重叠"""
+    x, y, w, h = room
+    return any((cx, cy) in cells for cx in range(x - 1, x + w + 1) for cy in range(y - 1, y + h + 1))
+
+
+def _room_center(room):
+    x, y, w, h = room
+    return x + w // 2, y + h // 2
+
+
+def _chain_key(room):
+    """房间连接顺序：按 16 列一条的竖带从左到右，带内蛇形上下交替，走廊不会横穿整张地图"""
+    x, y = _room_center(room)
+    band = x // CHAIN_BAND_WIDTH
+    return band, y if band % 2 == 0 else -y
+
+
+def _carve_corridor(open_cells, start, end, rng):
+    """L 形走廊，随机先横后竖或先竖后横"""
+    (x0, y0), (x1, y1) = start, end
+    corner = (x1, y0) if rng.random() < 0.5 else (x0, y1)
+    for (ax, ay), (bx, by) in ((start, corner), (corner, end)):
+        for x in range(min(ax, bx), max(ax, bx) + 1):
+            for y in range(min(ay, by), max(ay, by) + 1):
+                open_cells.add((x, y))
+
+
+def _reachable(open_cells, start):
+    seen = {start}
+    queue = deque([start])
+    while queue:
+        x, y = queue.popleft()
+        for cell in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if cell in open_cells and cell not in seen:
+                seen.add(cell)
+                queue.append(cell)
+    return seen
+
+
+def _place_secret_room(rng, rooms, open_cells, width, height):
+    """在某个房间旁边隔一堵墙放一个隐藏房间，返回 (房间, 暗门) 或 None"""
+    size = SECRET_ROOM_SIZE
+    for _ in range(50):
+        x, y, w, h = rng.choice(rooms)
+        side = rng.randrange(4)
+        if side == 0:  # 左
+            secret, door = (x - size - 1, y, size, size), (x - 1, y + 1)
+        elif side == 1:  # 右
+            secret, door = (x + w + 1, y, size, size), (x + w, y + 1)
+        elif side == 2:  # 上
+            secret, door = (x, y - size - 1, size, size), (x + 1, y - 1)
+        else:  # 下
+            secret, door = (x, y + h + 1, size, size), (x + 1, y + h)
+
+        sx, sy, _, _ = secret
+        if sx < 1 or sy < 1 or sx + size > width - 1 or sy + size > height - 1:
+            continue
+        # 隐藏房间及其一圈边界都必须是墙，只能经暗门进入
+        border = {(cx, cy) for cx in range(sx - 1, sx + size + 1) for cy in range(sy - 1, sy + size + 1)}
+        if door in open_cells or (border - {door}) & open_cells:
+            continue
+        return secret, door
+    return None
+
+
+def check_map_size(width, height):
+    """地图小于 MIN_MAP_SIZE 时抛出 FloorGenerationError"""
+    min_width, min_height = MIN_MAP_SIZE
+    if width < min_width or height < min_height:
+        raise FloorGenerationError(f"地图 {width}x{height} 太小，至少需要 {min_width}x{min_height}")
+
+
+def generate_floor(run_seed, floor, width, height) -> FloorLayout:
+    """生成一层地图：房间、连接房间的走廊、墙、隐藏房间和刷怪点。
+
+    结果只取决于 (run_seed, floor, width, height)。入口和出口固定在左右两侧
+    中点，由走廊保证连通。房间太挤放不下这一层的怪物时换一个派生种子重试，
+    重试 GENERATION_ATTEMPTS 次仍失败就抛出 FloorGenerationError，不会返回没有怪物的楼层。
+    """
+    check_map_size(width, height)
+    error = None
+    for attempt in range(GENERATION_ATTEMPTS):
+        # 第 0 次沿用原来的楼层种子，已有种子生成的楼层不变
+        seed = floor_seed(run_seed, floor) if attempt == 0 else derive_seed(run_seed, floor, attempt)
+        try:
+            return _generate_floor(random.Random(seed), floor, width, height)
+        except FloorGenerationError as e:
+            error = e
+    raise error
+
+
+def _generate_floor(rng, floor, width, height) -> FloorLayout:
+    entrance = (0, height // 2)
+    exit_cell = (width - 1, height // 2)
+
+    # 1. 随机放置互不相邻的矩形房间
+    rooms = []
+    room_cells = set()
+    target = max(3, width * height // 60)
+    for _ in range(target * 10):
+        if len(rooms) >= target:
+            break
+        w = rng.randint(*ROOM_WIDTH)
+        h = rng.randint(*ROOM_HEIGHT)
+        if width < w + 2 or height < h + 2:
+            continue
+        room = (rng.randint(1, width - w - 1), rng.randint(1, height - h - 1), w, h)
+        if not _touches(room, room_cells):
+            rooms.append(room)
+            room_cells.update(_room_cells(room))
+    rooms.sort(key=_chain_key)
+    open_cells = set(room_cells)
+
+    # 2. 从入口经过每个房间到出口连成一条走廊链，再随机加几条回路
+    points = [entrance] + [_room_center(room) for room in rooms] + [exit_cell]
+    for start, end in zip(points, points[1:]):
+        _carve_corridor(open_cells, start, end, rng)
+    for _ in range(len(rooms) // 3):
+        a, b = rng.sample(points[1:-1], 2)
+        _carve_corridor(open_cells, a, b, rng)
+
+    # 3. 隐藏房间
+    secret_doors, treasures = set(), set()
+    secret = _place_secret_room(rng, rooms, open_cells, width, height) if rooms else None
+    if secret is not None:
+        secret_room, door = secret
+        open_cells.update(_room_cells(secret_room))
+        open_cells.add(door)
+        secret_doors.add(door)
+        treasures.add(_room_center(secret_room))
+
+    walls = frozenset((x, y) for x in range(width) for y in range(height)) - open_cells
+    if exit_cell not in _reachable(open_cells, entrance):
+        raise FloorGenerationError(f"{width}x{height} 的第 {floor} 层入口与出口不连通")
+
+    # 4. 刷怪点：房间内、离入口足够远的格子，每只怪物一个格子
+    counts = [(MonsterType.NORMAL, rng.randint(*NORMAL_MONSTER_COUNT)),
+              (MonsterType.ELITE, rng.randint(*ELITE_MONSTER_COUNT)),
+              (MonsterType.BOSS, BOSS_MONSTER_COUNT)]
+    candidates = sorted(cell for cell in (room_cells or open_cells)
+                        if abs(cell[0] - entrance[0]) + abs(cell[1] - entrance[1]) >= SPAWN_SAFE_DISTANCE
+                        and cell != exit_cell)
+    types = [monster_type for monster_type, count in counts for _ in range(count)]
+    if len(candidates) < len(types):
+        # 少放怪物会让出口一开始就解锁，宁可报错
+        raise FloorGenerationError(f"{width}x{height} 的第 {floor} 层只有 {len(candidates)} 个刷怪格，"
+                                   f"放不下 {len(types)} 只怪物")
+    cells = rng.sample(candidates, len(types))
+    spawns = tuple(zip(types, cells))
+
+    return FloorLayout(floor, width, height, entrance, exit_cell, tuple(rooms), walls,
+                       frozenset(secret_doors), frozenset(treasures), spawns)
+
+
+class FloorCache:
+    """已生成楼层的 LRU 缓存，并在后台线程预生成下一层。
+
+    get() 优先返回缓存或已经在后台生成好的结果；prefetch() 把生成任务交给
+    单个工作线程，玩家在第 N 层时生成第 N+1 层，进入下一层时不再卡顿。
+    get() 遇到还没生成好的楼层会在当前线程等待，游戏循环里先用 ready() 确认。
+    """
+
+    def __init__(self, run_seed, width, height, max_size=FLOOR_CACHE_SIZE):
+        self.run_seed = run_seed
+        self.width = width
+        self.height = height
+        self.max_size = max_size
+        self.floors = OrderedDict()  # 楼层 -> Future
+        self.executor = None
+
+    def _remember(self, floor, future):
+        self.floors[floor] = future
+        self.floors.move_to_end(floor)
+        while len(self.floors) > self.max_size:
+            self.floors.popitem(last=False)
+
+    def prefetch(self, floor):
+        if floor in self.floors:
+            return
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="floor-generator")
+        self._remember(floor, self.executor.submit(generate_floor, self.run_seed, floor, self.width, self.height))
+
+    def ready(self, floor) -> bool:
+        """floor 已经生成好，get() 不会等待"""
+        future = self.floors.get(floor)
+        return future is not None and future.done()
+
+    def get(self, floor) -> FloorLayout:
+        future = self.floors.get(floor)
+        if future is None:
+            # 没有预生成时在当前线程生成
+            future = Future()
+            future.set_result(generate_floor(self.run_seed, floor, self.width, self.height))
+        self._remember(floor, future)
+        return future.result()
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
@@ -1,6 +1,5 @@
 # game4/systems/game_manager.py
 import pygame
-import random
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -9,17 +8,39 @@ from ..entities.player import Player
 from ..entities.monster import Monster
 from ..enums import GameState, Direction, MenuType  # 添加 MenuType 到这行
 from ..constants import *
-from ..utils.helpers import generate_monsters
+from ..utils.dirty_rects import DirtyRectTracker
+from ..utils.text_cache import text_cache
+from ..utils.perf_monitor import PerfMonitor, HISTOGRAM_BUCKETS
+from ..utils.log_panel import LogPanel
+from ..utils.helpers import roll_battle_rewards
+from ..utils.rng import RNGService, STREAM_BATTLE, STREAM_EQUIPMENT, STREAM_REWARDS, derive_seed
 from .battle_system import BattleSystem
 from .menu_system import MenuSystem
+from .occupancy import OccupancyGrid
+from .tilemap import ChunkedTilemap, Camera
+from .floor_generator import FloorCache, FloorLayout
+from .pathing import DistanceField
+from .replay import PygameInput
 
 
 class GameManager:
-    def __init__(self, screen, font):
+    def __init__(self, screen, font, dirty_rects: bool = False, map_size=None, seed=None, input_source=None,
+                 floor_cache: Optional[FloorCache] = None):
         self.screen = screen
         self.font = font
+        # 输入来源（get_events / get_pressed），录像和回放时替换成 replay 中的实现
+        self.input = input_source or PygameInput()
+        self.text_cache = text_cache
         self.clock = pygame.time.Clock()
 
+        # 性能统计与调试浮层（F3 切换）
+        self.perf = PerfMonitor(text_cache=self.text_cache)
+        self.show_perf_overlay = False
+
+        # 脏矩形渲染（可选）：探索状态下只提交变化的区域
+        self.dirty_rects = dirty_rects
+        self.dirty_tracker = DirtyRectTracker() if dirty_rects else None
+
         # 游戏状态
         self.state = GameState.EXPLORING
         self.floor = 1
@@ -28,33 +49,72 @@ class GameManager:
         self.player = Player()
         self.monsters: List[Monster] = []
         self.battle_system: Optional[BattleSystem] = None
+        self.log_panel: Optional[LogPanel] = None
+
+        # 菜单项渲染缓存（见 menu_item_surface）
+        self.menu_surfaces = {}
+        self.menu_surfaces_version = None
         self.menu_system: Optional[MenuSystem] = None
 
-        # 地图设置
-        self.map_width = MAP_COLS
-        self.map_height = MAP_ROWS
+        # 地图设置（map_size 为 (列数, 行数)，可以比屏幕大，摄像机跟随玩家）
+        self.map_width, self.map_height = map_size or (MAP_COLS, MAP_ROWS)
         self.entrance = (0, self.map_height // 2)  # 左侧中点
         self.exit = (self.map_width - 1, self.map_height // 2)  # 右侧中点
+        self.occupancy = OccupancyGrid(self.map_width, self.map_height)
+
+        # 所有随机数都来自本局种子：楼层布局由 (种子, 楼层) 决定，缓存起来并在后台预生成下一层；
+        # 装备、掉落、逃跑各用 rng 中独立的流；floor_cache 为重新开始时已在后台生成好第一层的缓存
+        self.rng = RNGService(seed)
+        self.seed = self.rng.seed
+        self.floor_cache = floor_cache or FloorCache(self.seed, self.map_width, self.map_height)
+        self.next_run: Optional[FloorCache] = None  # 游戏结束后为下一局预生成的楼层
+        self.restart_requested = False
+        self.layout: Optional[FloorLayout] = None
+        self.treasures = set()
+
+        # 怪物追击：所有怪物共用一个以玩家为起点的距离场
+        self.distance_field: Optional[DistanceField] = None
+        self.monster_move_timer = 0
+
+        # 分块缓存的背景层（草地、网格、墙、入口、出口），只绘制视口内的块
+        self.tilemap = ChunkedTilemap(self.map_width, self.map_height)
+        self.camera = Camera(SCREEN_WIDTH, GAME_AREA_HEIGHT, self.map_width * GRID_SIZE, self.map_height * GRID_SIZE)
+        self.viewport = pygame.Rect(0, 0, SCREEN_WIDTH, GAME_AREA_HEIGHT)
+        self.exit_open: Optional[bool] = None  # 背景中出口的状态，None 表示需要重新写入
 
         # 初始化玩家位置
         self.player.x, self.player.y = self.entrance
 
-        # 生成怪物
-        self.generate_monsters()
+        # 载入第一层
+        self.load_floor()
 
         # 移动相关
         self.move_timer = 0
         self.move_direction = None
 
+    def load_floor(self):
+        """载入当前楼层：布局从楼层缓存中取（通常已在后台生成好），然后预生成下一层"""
+        self.layout = self.floor_cache.get(self.floor)
+        self.tilemap.set_walls(self.layout.wall_tiles)
+        self.treasures = set(self.layout.treasures)
+        for cell in self.treasures:
+            self.tilemap.set_tile(cell, TREASURE_COLOR)
+        self.distance_field = DistanceField(self.map_width, self.map_height, self.layout.walls, MONSTER_AGGRO_RANGE)
+        self.monster_move_timer = 0
+        self.generate_monsters()
+        self.floor_cache.prefetch(self.floor + 1)
+
     def generate_monsters(self):
-        self.monsters = generate_monsters(self.floor)
-        # 设置怪物初始位置（简化处理）
-        for i, monster in enumerate(self.monsters):
-            monster.x = random.randint(5, self.map_width - 5)
-            monster.y = random.randint(2, self.map_height - 2)
+        """在布局的刷怪点上生成怪物，每只怪物占一个不同的格子"""
+        self.occupancy.clear()
+        self.monsters = []
+        for monster_type, (x, y) in self.layout.spawns:
+            monster = Monster(monster_type, self.floor)
+            self.occupancy.place(monster, x, y)
+            self.monsters.append(monster)
 
     def all_monsters_defeated(self):
-        return all(not monster.is_alive() for monster in self.monsters)
+        return self.occupancy.alive_count == 0
 
     def can_exit(self):
         return self.all_monsters_defeated()
@@ -75,12 +135,16 @@ class GameManager:
 
         # 边界检查
         if 0 <= new_x < self.map_width and 0 <= new_y < self.map_height:
+            # 墙挡住去路（暗门可以通过）
+            if self.layout.is_blocked(new_x, new_y):
+                return
+
             # 检查是否与怪物碰撞
-            for monster in self.monsters:
-                if monster.is_alive() and monster.x == new_x and monster.y == new_y:
-                    # 触发战斗
-                    self.start_battle([monster])
-                    return
+            monster = self.occupancy.get(new_x, new_y)
+            if monster is not None and monster.is_alive():
+                # 触发战斗
+                self.start_battle([monster])
+                return
 
             # 检查是否到达出口
             if (new_x, new_y) == self.exit and self.can_exit():
@@ -90,20 +154,54 @@ class GameManager:
             self.player.x = new_x
             self.player.y = new_y
 
+            if (new_x, new_y) in self.treasures:
+                self.open_treasure((new_x, new_y))
+
+    def open_treasure(self, cell):
+        """隐藏房间里的宝箱：获得面包和葡萄酒各一个"""
+        self.treasures.discard(cell)
+        self.tilemap.clear_tile(cell)
+        self.player.add_item("面包", 1)
+        self.player.add_item("葡萄酒", 1)
+
     def start_battle(self, monsters: List[Monster]):
         self.state = GameState.BATTLE
-        self.battle_system = BattleSystem(self.player, monsters, self.font)
+        self.battle_system = BattleSystem(self.player, monsters, self.font, rng=self.rng.stream(STREAM_BATTLE))
 
     def next_floor(self):
         self.floor += 1
         self.player.x, self.player.y = self.entrance
-        self.generate_monsters()
+        self.invalidate_background()
+        self.load_floor()
+
+    def invalidate_background(self):
+        """丢弃背景层的所有块，下一次绘制时按需重建"""
+        self.tilemap.clear()
+        self.exit_open = None
+        if self.dirty_tracker:
+            self.dirty_tracker.request_full_redraw()
+
+    def sync_tiles(self):
+        """把入口和出口写入背景层；出口解锁时只有出口所在的块失效"""
+        exit_open = self.can_exit()
+        if exit_open == self.exit_open:
+            return
+        self.tilemap.set_tile(self.entrance, GREEN)
+        self.tilemap.set_tile(self.exit, YELLOW if exit_open else GRAY)
+        self.exit_open = exit_open
 
     def handle_events(self):
-        for event in pygame.event.get():
+        for event in self.input.get_events():
             if event.type == pygame.QUIT:
                 return False
 
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.show_perf_overlay = not self.show_perf_overlay
+                if self.dirty_tracker and not self.show_perf_overlay:
+                    # 关掉浮层的这一帧整屏重画，擦掉浮层留下的像素
+                    self.dirty_tracker.request_full_redraw()
+                continue
+
             if self.state == GameState.EXPLORING:
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_UP:
@@ -116,7 +214,7 @@ class GameManager:
                         self.move_player(Direction.RIGHT)
                     elif event.key == pygame.K_i:
                         self.state = GameState.MENU
-                        self.menu_system = MenuSystem(self.player, self.font)
+                        self.menu_system = MenuSystem(self.player, self.font, rng=self.rng.stream(STREAM_EQUIPMENT))
 
             elif self.state == GameState.BATTLE:
                 if self.battle_system:
@@ -140,21 +238,11 @@ class GameManager:
                         self.battle_system.handle_input(mock_event)
 
                         # 检查战斗结果
-                        if self.battle_system.battle_result == "victory":
-                            self.state = GameState.EXPLORING
-                            self.battle_system = None
-                            # 给予奖励
-                            self.give_battle_rewards()
-                        elif self.battle_system.battle_result == "defeat":
-                            self.state = GameState.GAME_OVER
-                        elif self.battle_system.battle_result == "escape":
-                            self.state = GameState.EXPLORING
-                            self.battle_system = None
-                        elif not self.battle_system.is_player_turn:
-                            # 怪物回合
-                            self.battle_system.start_monster_turn()
-                            if self.battle_system.battle_result == "defeat":
-                                self.state = GameState.GAME_OVER
+                        outcome = self.battle_system.battle_result
+                        if outcome is None and not self.battle_system.is_player_turn:
+                            # 怪物回合：怪物身上的割裂也可能在这里把它打倒
+                            outcome = self.battle_system.start_monster_turn().outcome
+                        self.end_battle(outcome)
 
             elif self.state == GameState.MENU:
                 if self.menu_system:
@@ -188,20 +276,35 @@ class GameManager:
 
         return True
 
+    def end_battle(self, outcome):
+        """按战斗结果（"victory"、"defeat"、"escape"）切换状态，outcome 为 None 时战斗继续"""
+        if outcome is None:
+            return
+        if outcome in ("victory", "escape"):
+            # 被击败的怪物从占用索引中移除
+            self.occupancy.remove_defeated(self.battle_system.monsters)
+
+        if outcome == "defeat":
+            self.state = GameState.GAME_OVER
+        else:
+            self.state = GameState.EXPLORING
+            self.battle_system = None
+            if outcome == "victory":
+                # 给予奖励
+                self.give_battle_rewards()
+
     def give_battle_rewards(self):
         # 简化奖励系统
         self.player.gain_talent_point()
 
-        # 随机给予道具和装备
-        if random.random() < 0.8:  # 80% 概率获得苹果
-            self.player.add_item("苹果", 1)
-        if random.random() < 0.5:  # 50% 概率获得葡萄酒
-            self.player.add_item("葡萄酒", 1)
+        # 随机给予道具（80% 苹果，50% 葡萄酒）
+        for item in roll_battle_rewards(self.rng.stream(STREAM_REWARDS)):
+            self.player.add_item(item, 1)
 
     def update(self, dt):
         if self.state == GameState.EXPLORING:
             # 连续移动处理
-            keys = pygame.key.get_pressed()
+            keys = self.input.get_pressed()
             if keys[pygame.K_UP] or keys[pygame.K_DOWN] or keys[pygame.K_LEFT] or keys[pygame.K_RIGHT]:
                 self.move_timer += dt
                 if self.move_timer >= 200:  # 每200ms移动一次
@@ -217,7 +320,58 @@ class GameManager:
             else:
                 self.move_timer = 0
 
+            if self.state == GameState.EXPLORING:
+                self.update_monsters(dt)
+
+        elif self.state == GameState.GAME_OVER:
+            # 处理重新开始：按下 R 后等下一局的第一层在后台生成好再切换，不在这一帧里生成
+            if self.input.get_pressed()[pygame.K_r]:
+                self.restart_requested = True
+            if self.restart_requested and self.input.floor_ready(self.prepare_restart(), 1):
+                self.restart()
+
+    def update_monsters(self, dt):
+        """每隔 MONSTER_MOVE_INTERVAL 毫秒，仇恨范围内的怪物沿距离场朝玩家走一步，走到玩家身上就开战"""
+        self.monster_move_timer += dt
+        if self.monster_move_timer < MONSTER_MOVE_INTERVAL:
+            return
+        self.monster_move_timer = 0
+
+        player_cell = (self.player.x, self.player.y)
+        self.distance_field.update(player_cell)  # 玩家没换格子时直接复用
+
+        # 怪物不占入口、出口和宝箱格；玩家站在这些格子上时仍然可以走过去开战
+        blocked = {self.entrance, self.exit} | self.treasures
+        blocked.discard(player_cell)
+
+        def can_enter(x, y):
+            return (x, y) not in blocked and self.occupancy.is_free(x, y)
+
+        px, py = player_cell
+        reach = MONSTER_AGGRO_RANGE
+        for monster in self.occupancy.monsters_in(px - reach, py - reach, px + reach + 1, py + reach + 1):
+            step = self.distance_field.next_step(monster.x, monster.y, can_enter)
+            if step is None:
+                continue
+            if step == player_cell:
+                self.start_battle([monster])
+                return
+            self.occupancy.move(monster, *step)
+
     def draw(self):
+        camera_moved = self.state == GameState.EXPLORING and self.camera.follow(self.player.x, self.player.y)
+
+        if self.dirty_tracker:
+            self.dirty_tracker.check_state(self.state)
+            if self.state != GameState.EXPLORING or self.show_perf_overlay or camera_moved:
+                # 只有探索画面按精灵跟踪脏区域；战斗、菜单和结束画面，
+                # 以及每帧都变的浮层、整个画面滚动的视口，都退回整屏刷新
+                self.dirty_tracker.request_full_redraw()
+            if self.state == GameState.EXPLORING and not self.dirty_tracker.full_redraw:
+                self.draw_exploring_dirty()
+                self.dirty_tracker.present()
+                return
+
         self.screen.fill(BLACK)
 
         if self.state == GameState.EXPLORING:
@@ -231,56 +385,134 @@ class GameManager:
         elif self.state == GameState.GAME_OVER:
             self.draw_game_over()
 
-        pygame.display.flip()
+        if self.show_perf_overlay:
+            self.draw_perf_overlay()
+
+        if self.dirty_tracker:
+            self.dirty_tracker.present()
+        else:
+            pygame.display.flip()
+
+    def exploring_sprites(self):
+        """探索画面中会变化的元素：[(key, 占用区域, 外观签名), ...]，按绘制顺序排列"""
+        # 出口本身画在背景层里，登记为精灵是为了解锁时只重绘这一格
+        sprites = [("exit", self.camera.cell_rect(*self.exit), (self.exit_open,))]
+
+        # 只取视口内存活的怪物；多取一行，下方怪物的血条可能露出来
+        x0, y0, x1, y1 = self.camera.visible_cells()
+        for monster in self.occupancy.monsters_in(x0, y0, x1, y1 + 1):
+            # 区域包含格子上方 6 像素的血条
+            rect = self.camera.cell_rect(monster.x, monster.y)
+            rect.inflate_ip(0, 6)
+            rect.move_ip(0, -3)
+            sprites.append((monster, rect, (monster.current_health, monster.max_health)))
+
+        sprites.append((self.player, self.camera.cell_rect(self.player.x, self.player.y), ()))
+
+        status_rect = pygame.Rect(0, SCREEN_HEIGHT - STATUS_BAR_HEIGHT, SCREEN_WIDTH, STATUS_BAR_HEIGHT)
+        sprites.append(("status", status_rect, (self.status_text(),)))
+        return sprites
+
+    def status_text(self):
+        return f"楼层: {self.floor} | 生命: {self.player.current_health}/{self.player.total_health} | 攻击: {self.player.total_attack} | 防御: {self.player.total_defense} | 技力: {self.player.current_energy}/{self.player.total_energy} | 天赋点: {self.player.talent_points}"
+
+    def draw_sprite(self, key, signature):
+        if key == "exit":
+            return
+        if key == "status":
+            self.draw_status_bar(signature[0])
+        elif key is self.player:
+            self.draw_player()
+        else:
+            self.draw_monster(key)
+
+    def draw_sprites(self, sprites, dirty=None):
+        """按顺序绘制精灵，dirty 不为 None 时只画与脏区域相交的；地图上的精灵裁剪到视口内"""
+        for key, rect, signature in sprites:
+            if dirty is not None and rect.collidelist(dirty) == -1:
+                continue
+            self.screen.set_clip(None if key == "status" else self.viewport)
+            self.draw_sprite(key, signature)
+        self.screen.set_clip(None)
 
     def draw_exploring(self):
-        self.screen.fill(GRASS_GREEN)  # 使用草绿色填充背景
-        # 绘制地图网格
-        for x in range(self.map_width):
-            for y in range(self.map_height):
-                rect = pygame.Rect(x * GRID_SIZE, y * GRID_SIZE, GRID_SIZE, GRID_SIZE)
-                pygame.draw.rect(self.screen, WHITE, rect, 1)
-
-        # 绘制入口和出口
-        entrance_rect = pygame.Rect(self.entrance[0] * GRID_SIZE, self.entrance[1] * GRID_SIZE, GRID_SIZE, GRID_SIZE)
-        pygame.draw.rect(self.screen, GREEN, entrance_rect)
-
-        exit_color = YELLOW if self.can_exit() else GRAY
-        exit_rect = pygame.Rect(self.exit[0] * GRID_SIZE, self.exit[1] * GRID_SIZE, GRID_SIZE, GRID_SIZE)
-        pygame.draw.rect(self.screen, exit_color, exit_rect)
-
-        # 绘制怪物
-        for monster in self.monsters:
-            if monster.is_alive():
-                monster_rect = pygame.Rect(monster.x * GRID_SIZE, monster.y * GRID_SIZE, GRID_SIZE, GRID_SIZE)
-                color = RED if monster.type == monster.type.NORMAL else (
-                255, 165, 0) if monster.type == monster.type.ELITE else PURPLE
-                pygame.draw.rect(self.screen, color, monster_rect)
-
-                # 绘制血条
-                bar_width = GRID_SIZE
-                bar_height = 4
-                hp_ratio = monster.current_health / monster.max_health
-                hp_bar_width = int(bar_width * hp_ratio)
-
-                bar_rect = pygame.Rect(monster.x * GRID_SIZE, monster.y * GRID_SIZE - 6, bar_width, bar_height)
-                hp_bar_rect = pygame.Rect(monster.x * GRID_SIZE, monster.y * GRID_SIZE - 6, hp_bar_width, bar_height)
-
-                pygame.draw.rect(self.screen, GRAY, bar_rect)
-                pygame.draw.rect(self.screen, GREEN, hp_bar_rect)
-
-        # 绘制玩家
-        player_rect = pygame.Rect(self.player.x * GRID_SIZE, self.player.y * GRID_SIZE, GRID_SIZE, GRID_SIZE)
-        pygame.draw.rect(self.screen, BLUE, player_rect)
-
-        # 绘制状态栏
+        self.sync_tiles()
+        self.perf.count("draw_calls", self.tilemap.draw(self.screen, self.camera))
+
+        sprites = self.exploring_sprites()
+        self.draw_sprites(sprites)
+
+        if self.dirty_tracker:
+            # 记录本帧精灵作为下一帧比较的基准
+            self.dirty_tracker.diff_sprites(sprites)
+
+    def draw_exploring_dirty(self):
+        """脏矩形模式：只从背景层恢复并重绘发生变化的区域"""
+        self.sync_tiles()
+        sprites = self.exploring_sprites()
+        dirty = self.dirty_tracker.diff_sprites(sprites)
+        if not dirty:
+            return
+
+        for rect in dirty:
+            area = rect.clip(self.viewport)
+            if area.width and area.height:
+                self.perf.count("draw_calls", self.tilemap.draw(self.screen, self.camera, area))
+
+        # 与脏区域相交的精灵都要重绘，保证重叠部分正确
+        self.draw_sprites(sprites, dirty)
+
+    def render_text(self, text, antialias, color):
+        """所有文字渲染都经过共享的 LRU 缓存"""
+        return self.text_cache.render(self.font, text, antialias, color)
+
+    def menu_item_surface(self, menu_version, index, text, color):
+        """菜单项的渲染结果按菜单版本缓存，版本变化时整体作废"""
+        if self.menu_surfaces_version != menu_version:
+            self.menu_surfaces_version = menu_version
+            self.menu_surfaces = {}
+        key = (index, text, color)
+        surface = self.menu_surfaces.get(key)
+        if surface is None:
+            surface = self.menu_surfaces[key] = self.render_text(text, True, color)
+        return surface
+
+    def draw_rect(self, color, rect, width=0):
+        self.perf.count("draw_calls")
+        return pygame.draw.rect(self.screen, color, rect, width)
+
+    def blit(self, surface, dest, area=None):
+        self.perf.count("draw_calls")
+        return self.screen.blit(surface, dest, area)
+
+    def draw_monster(self, monster):
+        monster_rect = self.camera.cell_rect(monster.x, monster.y)
+        color = RED if monster.type == monster.type.NORMAL else (
+        255, 165, 0) if monster.type == monster.type.ELITE else PURPLE
+        self.draw_rect(color, monster_rect)
+
+        # 绘制血条
+        bar_width = GRID_SIZE
+        bar_height = 4
+        hp_ratio = monster.current_health / monster.max_health
+        hp_bar_width = int(bar_width * hp_ratio)
+
+        bar_rect = pygame.Rect(monster_rect.x, monster_rect.y - 6, bar_width, bar_height)
+        hp_bar_rect = pygame.Rect(monster_rect.x, monster_rect.y - 6, hp_bar_width, bar_height)
+
+        self.draw_rect(GRAY, bar_rect)
+        self.draw_rect(GREEN, hp_bar_rect)
+
+    def draw_player(self):
+        self.draw_rect(BLUE, self.camera.cell_rect(self.player.x, self.player.y))
+
+    def draw_status_bar(self, status_text):
         status_rect = pygame.Rect(0, SCREEN_HEIGHT - STATUS_BAR_HEIGHT, SCREEN_WIDTH, STATUS_BAR_HEIGHT)
-        pygame.draw.rect(self.screen, DARK_GRAY, status_rect)
+        self.draw_rect(DARK_GRAY, status_rect)
 
         # 绘制玩家状态信息
-        status_text = f"楼层: {self.floor} | 生命: {self.player.current_health}/{self.player.total_health} | 攻击: {self.player.total_attack} | 防御: {self.player.total_defense} | 技力: {self.player.current_energy}/{self.player.total_energy} | 天赋点: {self.player.talent_points}"
-        text_surface = self.font.render(status_text, True, WHITE)
-        self.screen.blit(text_surface, (10, SCREEN_HEIGHT - STATUS_BAR_HEIGHT + 10))
+        text_surface = self.render_text(status_text, True, WHITE)
+        self.blit(text_surface, (10, SCREEN_HEIGHT - STATUS_BAR_HEIGHT + 10))
 
     def draw_battle(self):
         if not self.battle_system:
@@ -288,18 +520,18 @@ class GameManager:
 
         # 左侧区域
         left_rect = pygame.Rect(0, 0, BATTLE_LEFT_WIDTH, SCREEN_HEIGHT)
-        pygame.draw.rect(self.screen, DARK_GRAY, left_rect)
+        self.draw_rect(DARK_GRAY, left_rect)
 
         # 动画区域
         animation_rect = pygame.Rect(0, 0, BATTLE_LEFT_WIDTH, BATTLE_ANIMATION_HEIGHT)
-        pygame.draw.rect(self.screen, LIGHT_BLUE, animation_rect)
+        self.draw_rect(LIGHT_BLUE, animation_rect)
 
         # 显示怪物信息
         if self.battle_system.current_monster:
             monster = self.battle_system.current_monster
             monster_text = f"{monster.type.value} (等级 {self.floor})"
-            text_surface = self.font.render(monster_text, True, BLACK)
-            self.screen.blit(text_surface, (10, 10))
+            text_surface = self.render_text(monster_text, True, BLACK)
+            self.blit(text_surface, (10, 10))
 
             # 血条
             bar_width = 200
@@ -310,16 +542,16 @@ class GameManager:
             bar_rect = pygame.Rect(10, 40, bar_width, bar_height)
             hp_bar_rect = pygame.Rect(10, 40, hp_bar_width, bar_height)
 
-            pygame.draw.rect(self.screen, GRAY, bar_rect)
-            pygame.draw.rect(self.screen, RED, hp_bar_rect)
+            self.draw_rect(GRAY, bar_rect)
+            self.draw_rect(RED, hp_bar_rect)
 
             hp_text = f"{monster.current_health}/{monster.max_health}"
-            hp_text_surface = self.font.render(hp_text, True, BLACK)
-            self.screen.blit(hp_text_surface, (10, 42))
+            hp_text_surface = self.render_text(hp_text, True, BLACK)
+            self.blit(hp_text_surface, (10, 42))
 
         # 玩家属性区域
         player_info_rect = pygame.Rect(0, BATTLE_ANIMATION_HEIGHT, BATTLE_LEFT_WIDTH, BATTLE_PLAYER_INFO_HEIGHT)
-        pygame.draw.rect(self.screen, BROWN, player_info_rect)
+        self.draw_rect(BROWN, player_info_rect)
 
         # 显示玩家信息
         player_stats = [
@@ -330,21 +562,21 @@ class GameManager:
         ]
 
         for i, stat in enumerate(player_stats):
-            text_surface = self.font.render(stat, True, WHITE)
-            self.screen.blit(text_surface, (10, BATTLE_ANIMATION_HEIGHT + 10 + i * 25))
+            text_surface = self.render_text(stat, True, WHITE)
+            self.blit(text_surface, (10, BATTLE_ANIMATION_HEIGHT + 10 + i * 25))
 
         # BUFF状态
         buff_y = BATTLE_ANIMATION_HEIGHT + 120
         active_buffs = self.player.get_active_buffs()
         if active_buffs:
             buff_text = "状态: " + ", ".join([f"{buff.name}({buff.duration})" for buff in active_buffs])
-            text_surface = self.font.render(buff_text, True, WHITE)
-            self.screen.blit(text_surface, (10, buff_y))
+            text_surface = self.render_text(buff_text, True, WHITE)
+            self.blit(text_surface, (10, buff_y))
 
         # 战斗选项区域
         menu_rect = pygame.Rect(0, BATTLE_ANIMATION_HEIGHT + BATTLE_PLAYER_INFO_HEIGHT, BATTLE_LEFT_WIDTH,
                                 BATTLE_MENU_HEIGHT)
-        pygame.draw.rect(self.screen, GRAY, menu_rect)
+        self.draw_rect(GRAY, menu_rect)
 
         # 绘制菜单
         menu_items = self.battle_system.get_current_menu_items()
@@ -352,18 +584,15 @@ class GameManager:
                         self.battle_system.scroll_offset:self.battle_system.scroll_offset + self.battle_system.max_visible_items]
 
         for i, item in enumerate(visible_items):
-            color = YELLOW if i + self.battle_system.scroll_offset == self.battle_system.selected_menu_index else WHITE
-            text_surface = self.font.render(item, True, color)
-            self.screen.blit(text_surface, (20, BATTLE_ANIMATION_HEIGHT + BATTLE_PLAYER_INFO_HEIGHT + 20 + i * 30))
+            index = i + self.battle_system.scroll_offset
+            color = YELLOW if index == self.battle_system.selected_menu_index else WHITE
+            text_surface = self.menu_item_surface(("battle", self.battle_system.menu_version), index, item, color)
+            self.blit(text_surface, (20, BATTLE_ANIMATION_HEIGHT + BATTLE_PLAYER_INFO_HEIGHT + 20 + i * 30))
 
-        # 右侧日志区域
-        log_rect = pygame.Rect(BATTLE_LEFT_WIDTH, 0, BATTLE_RIGHT_WIDTH, SCREEN_HEIGHT)
-        pygame.draw.rect(self.screen, BLACK, log_rect)
-
-        # 绘制战斗日志
-        for i, log_entry in enumerate(self.battle_system.battle_log[:15]):  # 最多显示15条日志
-            text_surface = self.font.render(log_entry, True, WHITE)
-            self.screen.blit(text_surface, (BATTLE_LEFT_WIDTH + 10, 10 + i * 25))
+        # 右侧日志区域：预先合成的面板，只渲染新增的日志（最多显示15条）
+        if self.log_panel is None:
+            self.log_panel = LogPanel(self.render_text, (BATTLE_RIGHT_WIDTH, SCREEN_HEIGHT), max_lines=15)
+        self.blit(self.log_panel.update(self.battle_system.battle_log), (BATTLE_LEFT_WIDTH, 0))
 
     def draw_menu(self):
         if not self.menu_system:
@@ -373,7 +602,7 @@ class GameManager:
         overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
         overlay.set_alpha(128)
         overlay.fill(BLACK)
-        self.screen.blit(overlay, (0, 0))
+        self.blit(overlay, (0, 0))
 
         # 绘制菜单标题
         title_text = "主菜单"
@@ -386,9 +615,9 @@ class GameManager:
         elif self.menu_system.current_menu == MenuType.SYNTHESIS:
             title_text = "装备合成"
 
-        title_surface = self.font.render(title_text, True, WHITE)
+        title_surface = self.render_text(title_text, True, WHITE)
         title_rect = title_surface.get_rect(center=(SCREEN_WIDTH // 2, 50))
-        self.screen.blit(title_surface, title_rect)
+        self.blit(title_surface, title_rect)
 
         # 绘制菜单项
         menu_items = self.menu_system.get_menu_items()
@@ -397,37 +626,88 @@ class GameManager:
 
         start_y = 100
         for i, item in enumerate(visible_items):
-            color = YELLOW if i + self.menu_system.scroll_offset == self.menu_system.selected_index else WHITE
-            text_surface = self.font.render(item, True, color)
+            index = i + self.menu_system.scroll_offset
+            color = YELLOW if index == self.menu_system.selected_index else WHITE
+            text_surface = self.menu_item_surface(("menu", self.menu_system.menu_version), index, item, color)
             text_rect = text_surface.get_rect(center=(SCREEN_WIDTH // 2, start_y + i * 40))
-            self.screen.blit(text_surface, text_rect)
+            self.blit(text_surface, text_rect)
 
     def draw_game_over(self):
         self.screen.fill(BLACK)
 
         # 绘制游戏结束文字
-        game_over_text = self.font.render("游戏结束", True, RED)
+        game_over_text = self.render_text("游戏结束", True, RED)
         game_over_rect = game_over_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50))
-        self.screen.blit(game_over_text, game_over_rect)
+        self.blit(game_over_text, game_over_rect)
 
         # 绘制最终信息
-        final_text = self.font.render(f"你到达了第 {self.floor} 层", True, WHITE)
+        final_text = self.render_text(f"你到达了第 {self.floor} 层", True, WHITE)
         final_rect = final_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
-        self.screen.blit(final_text, final_rect)
+        self.blit(final_text, final_rect)
 
         # 绘制重新开始提示
-        restart_text = self.font.render("按 R 重新开始，按 ESC 退出", True, WHITE)
+        hint = "正在生成新的地图..." if self.restart_requested else "按 R 重新开始，按 ESC 退出"
+        restart_text = self.render_text(hint, True, WHITE)
         restart_rect = restart_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50))
-        self.screen.blit(restart_text, restart_rect)
-
-        # 处理重新开始
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_r]:
-            self.__init__(self.screen, self.font)  # 重新初始化游戏
+        self.blit(restart_text, restart_rect)
+
+    def prepare_restart(self) -> FloorCache:
+        """为下一局建好楼层缓存并在后台生成第一层；新种子由旧种子推导，录像回放时保持一致"""
+        if self.next_run is None:
+            self.next_run = FloorCache(derive_seed(self.seed, "restart"), self.map_width, self.map_height)
+            self.next_run.prefetch(1)
+        return self.next_run
+
+    def restart(self):
+        """重新初始化游戏，保留渲染选项和输入来源，沿用 prepare_restart 预生成的楼层"""
+        show_perf_overlay = self.show_perf_overlay
+        next_run = self.prepare_restart()
+        self.floor_cache.close()
+        self.__init__(self.screen, self.font, dirty_rects=self.dirty_rects, map_size=(self.map_width, self.map_height),
+                      seed=next_run.run_seed, input_source=self.input, floor_cache=next_run)
+        self.show_perf_overlay = show_perf_overlay
 
     def run(self, dt):
-        if not self.handle_events():
+        self.perf.begin_frame()
+        with self.perf.phase("events"):
+            running = self.handle_events()
+        if not running:
             return False
-        self.update(dt)
-        self.draw()
-        return True
\ No newline at end of file
+        with self.perf.phase("update"):
+            self.update(dt)
+        with self.perf.phase("draw"):
+            self.draw()
+        self.perf.end_frame(dt)
+        return True
+
+    def draw_perf_overlay(self):
+        """调试浮层：FPS、帧时间直方图、各阶段耗时和本帧绘制计数（显示上一帧的数据）"""
+        stats = self.perf.snapshot()
+        panel = pygame.Surface((280, 170))
+        panel.set_alpha(200)
+        panel.fill(BLACK)
+
+        phases = stats["phases"]
+        counters = stats["counters"]
+        lines = [
+            f"FPS: {stats['fps']:.1f}  帧: {stats['frame_ms']:.2f}ms",
+            f"事件 {phases.get('events', 0):.2f}  更新 {phases.get('update', 0):.2f}  绘制 {phases.get('draw', 0):.2f} ms",
+            f"文字: {counters.get('text_renders', 0)} (光栅化 {counters.get('glyph_renders', 0)})",
+            f"绘制调用: {counters.get('draw_calls', 0)}",
+        ]
+        # 浮层文字每帧都变，直接渲染，不占用共享文字缓存
+        for i, line in enumerate(lines):
+            panel.blit(self.font.render(line, True, WHITE), (8, 6 + i * 22))
+
+        # 帧时间直方图
+        histogram = stats["histogram"]
+        total = max(1, sum(histogram))
+        labels = [f"<{limit}" for limit in HISTOGRAM_BUCKETS] + [f">{HISTOGRAM_BUCKETS[-1]}"]
+        bar_width = 280 // len(histogram)
+        for i, count in enumerate(histogram):
+            height = int(50 * count / total)
+            pygame.draw.rect(panel, GREEN if i < 2 else YELLOW if i < 3 else RED,
+                             (i * bar_width + 4, 150 - height, bar_width - 8, height))
+            panel.blit(self.font.render(labels[i], True, WHITE), (i * bar_width + 4, 152))
+
+        self.screen.blit(panel, (SCREEN_WIDTH - 290, 10))
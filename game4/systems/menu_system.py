@@ -1,5 +1,6 @@
 # game4/systems/menu_system.py
 from typing import List, Tuple, Dict
+import random
 import sys
 import os
 
@@ -10,9 +11,16 @@ from ..enums import MenuType, EquipmentType
 
 
 class MenuSystem:
-    def __init__(self, player: Player, font):
+    def __init__(self, player: Player, font, rng=random):
         self.player = player
         self.font = font
+        self.rng = rng
+
+        # 菜单自身状态（当前页、选中的装备部位、候选装备）变化时递增
+        self.version = 0
+        self._menu_items: List[str] = []
+        self._menu_items_key = None
+
         self.current_menu = MenuType.MAIN
         self.selected_index = 0
         self.scroll_offset = 0
@@ -25,6 +33,29 @@ class MenuSystem:
         # 合成菜单专用变量
         self.synthesis_selected_items = []
 
+    @property
+    def current_menu(self):
+        return self._current_menu
+
+    @current_menu.setter
+    def current_menu(self, value):
+        self._current_menu = value
+        self.version += 1
+
+    @property
+    def equipment_selected_part(self):
+        return self._equipment_selected_part
+
+    @equipment_selected_part.setter
+    def equipment_selected_part(self, value):
+        self._equipment_selected_part = value
+        self.version += 1
+
+    @property
+    def menu_version(self):
+        """菜单内容的版本：菜单状态或玩家数据变化时改变"""
+        return self.version, self.player.version
+
     def handle_input(self, event):
         if event.type == "KEYDOWN":
             if event.key == "UP":
@@ -171,19 +202,7 @@ class MenuSystem:
             self.selected_index = 3
 
     def upgrade_attribute(self, index):
-        if self.player.spend_talent_point():
-            if index == 0:  # 攻击力
-                self.player.base_attack += 3
-            elif index == 1:  # 体力
-                self.player.base_health += 10
-                # 同步当前血量
-                self.player.current_health = self.player.total_health
-            elif index == 2:  # 防御力
-                self.player.base_defense += 1
-            elif index == 3:  # 技力
-                self.player.base_energy += 3
-                # 同步当前技力
-                self.player.current_energy = self.player.total_energy
+        self.player.upgrade_attribute(index)
 
     def refresh_equipment_list(self):
         # 简化处理，实际应该从装备库存中获取
@@ -192,10 +211,19 @@ class MenuSystem:
         for i in range(5):
             part = self.equipment_selected_part
             if part:
-                equipment = Equipment(1, part)
+                equipment = Equipment(1, part, self.rng)
                 self.equipment_list.append(equipment)
+        self.version += 1
 
     def get_menu_items(self) -> List[str]:
+        """当前菜单项，只在 menu_version 变化时重建（返回的列表不要修改）"""
+        key = self.menu_version
+        if self._menu_items_key != key:
+            self._menu_items = self.build_menu_items()
+            self._menu_items_key = key
+        return self._menu_items
+
+    def build_menu_items(self) -> List[str]:
         if self.current_menu == MenuType.MAIN:
             return ["能力编辑", "装备编辑", "道具使用", "装备合成", "返回"]
         elif self.current_menu == MenuType.ABILITY:
@@ -0,0 +1,65 @@
+# game4/systems/occupancy.py
+from typing import Dict, Optional, Tuple
+
+from ..entities.monster import Monster
+
+
+class OccupancyGrid:
+    """地图格子占用索引：格子 -> 怪物，以及存活怪物计数。
+
+    怪物放置、移动、被击败时都通过这里更新，碰撞检测和出口判断都是 O(1)。
+    索引里只保存存活的怪物，绘制时直接遍历 monsters() 即可。
+    """
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.cells: Dict[Tuple[int, int], Monster] = {}
+
+    @property
+    def alive_count(self):
+        return len(self.cells)
+
+    def in_bounds(self, x, y):
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def get(self, x, y) -> Optional[Monster]:
+        return self.cells.get((x, y))
+
+    def is_free(self, x, y):
+        return (x, y) not in self.cells
+
+    def place(self, monster: Monster, x, y):
+        if (x, y) in self.cells:
+            raise ValueError(f"格子 ({x}, {y}) 已被占用")
+        monster.x, monster.y = x, y
+        self.cells[(x, y)] = monster
+
+    def remove(self, monster: Monster):
+        """移除怪物（被击败时调用）；怪物不在索引中时忽略"""
+        if self.cells.get((monster.x, monster.y)) is monster:
+            del self.cells[(monster.x, monster.y)]
+
+    def move(self, monster: Monster, x, y):
+        if self.cells.get((x, y)) not in (None, monster):
+            raise ValueError(f"格子 ({x}, {y}) 已被占用")
+        self.remove(monster)
+        self.place(monster, x, y)
+
+    def remove_defeated(self, monsters):
+        for monster in monsters:
+            if not monster.is_alive():
+                self.remove(monster)
+
+    def monsters(self):
+        return self.cells.values()
+
+    def monsters_in(self, x0, y0, x1, y1):
+        """区域 [x0, x1) × [y0, y1) 内的怪物；区域格子数少于怪物数时逐格查找"""
+        if (x1 - x0) * (y1 - y0) < len(self.cells):
+            found = (self.cells.get((x, y)) for y in range(y0, y1) for x in range(x0, x1))
+            return [monster for monster in found if monster is not None]
+        return [monster for monster in self.cells.values() if x0 <= monster.x < x1 and y0 <= monster.y < y1]
+
+    def clear(self):
+        self.cells.clear()
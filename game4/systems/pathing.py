@@ -0,0 +1,74 @@
+# game4/systems/pathing.py
+from array import array
+from typing import Callable, Optional, Tuple
+
+
+class DistanceField:
+    """以目标格子（玩家）为起点的 BFS 距离场，所有怪物共用。
+
+    只有目标换了格子时才重新计算；max_distance 限制搜索半径（怪物的仇恨范围），
+    重算的代价与半径有关而与地图大小无关。每个格子记下写入时的“代数”，
+    旧代数的格子视为不可达，重算前不需要清空整张数组。
+    怪物每一步只看四个相邻格子，沿距离递减的方向走，O(1)。
+    """
+
+    def __init__(self, width, height, blocked=(), max_distance=None):
+        self.width = width
+        self.height = height
+        self.max_distance = max_distance
+        self.passable = bytearray(b"\x01") * (width * height)
+        for x, y in blocked:
+            self.passable[y * width + x] = 0
+        self.distances = array("i", [0]) * (width * height)
+        self.stamps = array("i", [0]) * (width * height)
+        self.generation = 0
+        self.target: Optional[Tuple[int, int]] = None
+        self.recomputes = 0
+
+    def update(self, target) -> bool:
+        """目标换了格子时重算距离场，返回是否重算"""
+        if target == self.target:
+            return False
+        self.target = target
+        self.generation += 1
+        self.recomputes += 1
+
+        width = self.width
+        size = width * self.height
+        passable, distances, stamps, generation = self.passable, self.distances, self.stamps, self.generation
+        limit = self.max_distance
+
+        start = target[1] * width + target[0]
+        stamps[start] = generation
+        distances[start] = 0
+        frontier = [start]
+        distance = 0
+        while frontier and (limit is None or distance < limit):
+            distance += 1
+            next_frontier = []
+            for i in frontier:
+                x = i % width
+                for j in (i - width, i + width, i - 1 if x > 0 else -1, i + 1 if x < width - 1 else -1):
+                    if 0 <= j < size and passable[j] and stamps[j] != generation:
+                        stamps[j] = generation
+                        distances[j] = distance
+                        next_frontier.append(j)
+            frontier = next_frontier
+        return True
+
+    def distance(self, x, y) -> Optional[int]:
+        """到目标的步数，超出范围或不可达时返回 None"""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        i = y * self.width + x
+        return self.distances[i] if self.stamps[i] == self.generation else None
+
+    def next_step(self, x, y, is_free: Callable[[int, int], bool] = None):
+        """沿距离场下降一步：返回离目标近一步且 is_free 的相邻格子，没有时返回 None"""
+        distance = self.distance(x, y)
+        if not distance:
+            return None
+        for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if self.distance(nx, ny) == distance - 1 and (is_free is None or is_free(nx, ny)):
+                return nx, ny
+        return None
@@ -0,0 +1,223 @@
+# game4/systems/replay.py
+import gzip
+import hashlib
+import json
+from typing import Dict, List, Optional
+
+import pygame
+
+# 录像文件格式版本
+REPLAY_VERSION = 1
+# 每隔多少帧记录一次状态哈希
+HASH_INTERVAL = 60
+# 游戏通过 get_pressed 读取的按键（连续移动、结束画面按 R 重新开始）
+WATCHED_KEYS = (pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT, pygame.K_r)
+# 需要录下的事件类型
+RECORDED_EVENTS = {pygame.QUIT: "QUIT", pygame.KEYDOWN: "KEYDOWN", pygame.KEYUP: "KEYUP"}
+EVENT_TYPES = {name: event_type for event_type, name in RECORDED_EVENTS.items()}
+
+
+class PygameInput:
+    """GameManager 默认的输入来源：直接读 pygame 的事件队列和键盘状态"""
+
+    def get_events(self):
+        return pygame.event.get()
+
+    def get_pressed(self):
+        return pygame.key.get_pressed()
+
+    def floor_ready(self, floor_cache, floor):
+        """后台生成的楼层是否已经好了；和按键一样是游戏之外的输入，录像时要记下来"""
+        return floor_cache.ready(floor)
+
+
+class HeldKeys:
+    """按下的按键集合，按 pygame.key.get_pressed() 的方式用键码下标访问"""
+
+    def __init__(self, held=()):
+        self.held = frozenset(held)
+
+    def __getitem__(self, key):
+        return key in self.held
+
+
+class ReplayDivergence(Exception):
+    """回放时状态哈希与录像不一致"""
+
+    def __init__(self, frame, expected, actual):
+        super().__init__(f"第 {frame} 帧状态不一致: 录像 {expected}, 回放 {actual}")
+        self.frame = frame
+        self.expected = expected
+        self.actual = actual
+
+
+def state_hash(game) -> str:
+    """影响后续游戏进程的状态摘要：楼层、状态、玩家、怪物、战斗和计时器"""
+    player = game.player
+    battle = game.battle_system
+    parts = (
+        game.seed, game.floor, game.state.name, game.move_timer, game.monster_move_timer,
+        player.x, player.y, player.current_health, player.current_energy, player.talent_points,
+        player.base_attack, player.base_health, player.base_defense, player.base_energy,
+        sorted(player.inventory.items()),
+        sorted((m.x, m.y, m.type.name, m.current_health) for m in game.occupancy.monsters()),
+        (battle.battle_result, battle.is_player_turn, battle.menu_state, battle.selected_menu_index,
+         [m.current_health for m in battle.monsters]) if battle else None,
+    )
+    return hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()[:16]
+
+
+class Recording:
+    """一段录像：本局种子、地图大小，以及每帧的 dt、事件和按键变化。
+
+    frames 中每帧为 [dt]、[dt, 事件] 或 [dt, 事件, 按键]，事件为 [类型名, 键码] 列表，
+    按键只在与上一帧不同时写出；hashes 为 {帧序号: 状态哈希}；loading_frames 为
+    等待后台生成楼层的帧序号。文件是 gzip 压缩的 JSON。
+    """
+
+    def __init__(self, seed, map_size, frames=None, hashes=None, hash_interval=HASH_INTERVAL, loading_frames=None):
+        self.seed = seed
+        self.map_size = tuple(map_size)
+        self.frames: List[list] = frames if frames is not None else []
+        self.hashes: Dict[int, str] = hashes if hashes is not None else {}
+        self.hash_interval = hash_interval
+        self.loading_frames: List[int] = loading_frames if loading_frames is not None else []
+
+    def save(self, path):
+        data = {
+            "version": REPLAY_VERSION,
+            "seed": self.seed,
+            "map_size": list(self.map_size),
+            "hash_interval": self.hash_interval,
+            "frames": self.frames,
+            "hashes": {str(frame): value for frame, value in self.hashes.items()},
+            "loading_frames": self.loading_frames,
+        }
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path) -> "Recording":
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != REPLAY_VERSION:
+            raise ValueError(f"不支持的录像版本: {data.get('version')}")
+        hashes = {int(frame): value for frame, value in data["hashes"].items()}
+        return cls(data["seed"], data["map_size"], data["frames"], hashes, data["hash_interval"],
+                   data.get("loading_frames", []))
+
+
+class InputRecorder:
+    """包在输入来源外面，把 GameManager 读到的事件和按键原样记下来。
+
+    每帧调用 begin_frame(dt)，帧结束（game.run 之后）调用 end_frame()。
+    """
+
+    def __init__(self, game, source=None, hash_interval=HASH_INTERVAL):
+        self.game = game
+        self.source = source or game.input
+        self.recording = Recording(game.seed, (game.map_width, game.map_height), hash_interval=hash_interval)
+        self.frame: Optional[list] = None
+        self.held = None
+        game.input = self
+
+    def begin_frame(self, dt):
+        self.frame = [dt, []]
+
+    def get_events(self):
+        events = self.source.get_events()
+        for event in events:
+            name = RECORDED_EVENTS.get(event.type)
+            if name is not None:
+                self.frame[1].append([name, getattr(event, "key", None)])
+        return events
+
+    def get_pressed(self):
+        keys = self.source.get_pressed()
+        held = [key for key in WATCHED_KEYS if keys[key]]
+        if held != self.held:
+            self.held = held
+            self.frame[2:] = [held]
+        return keys
+
+    def floor_ready(self, floor_cache, floor):
+        ready = self.source.floor_ready(floor_cache, floor)
+        if not ready:
+            self.recording.loading_frames.append(len(self.recording.frames) + 1)
+        return ready
+
+    def end_frame(self):
+        frame = self.frame
+        if len(frame) == 2 and not frame[1]:
+            frame.pop()
+        recording = self.recording
+        recording.frames.append(frame)
+        index = len(recording.frames)
+        if index % recording.hash_interval == 0:
+            # 游戏重新开始后种子会变，哈希里带上当前种子
+            recording.hashes[index] = state_hash(self.game)
+        self.frame = None
+
+    def save(self, path):
+        self.recording.save(path)
+
+
+class ReplayInput:
+    """回放时的输入来源：按帧返回录下的事件和按键"""
+
+    def __init__(self, recording: Recording):
+        self.recording = recording
+        self.events = []
+        self.held = HeldKeys()
+        self.index = 0
+        self.loading_frames = frozenset(recording.loading_frames)
+
+    def load_frame(self, frame):
+        """切换到下一帧，返回该帧的 dt"""
+        self.index += 1
+        self.events = []
+        for name, key in (frame[1] if len(frame) > 1 else ()):
+            if key is None:
+                self.events.append(pygame.event.Event(EVENT_TYPES[name]))
+            else:
+                self.events.append(pygame.event.Event(EVENT_TYPES[name], key=key))
+        if len(frame) > 2:
+            self.held = HeldKeys(frame[2])
+        return frame[0]
+
+    def get_events(self):
+        events, self.events = self.events, []
+        return events
+
+    def get_pressed(self):
+        return self.held
+
+    def floor_ready(self, floor_cache, floor):
+        # 录像时还在生成的帧照样等待，其余帧直接用 get() 等生成完成，和录像时在同一帧切换
+        return self.index not in self.loading_frames
+
+
+def replay(game, recording: Recording, draw=False, on_frame=None):
+    """不限帧率地把录像喂给 game（需以 input_source=ReplayInput(recording) 创建），返回回放的帧数。
+
+    每个录下哈希的帧都会比对状态，不一致时抛出 ReplayDivergence。
+    draw 为 False 时跳过绘制，只跑游戏逻辑；on_frame(帧序号) 在每帧结束后调用。
+    """
+    source = game.input
+    for index, frame in enumerate(recording.frames, 1):
+        dt = source.load_frame(frame)
+        running = game.handle_events()
+        if running:
+            game.update(dt)
+            if draw:
+                game.draw()
+        expected = recording.hashes.get(index)
+        if expected is not None:
+            actual = state_hash(game)
+            if actual != expected:
+                raise ReplayDivergence(index, expected, actual)
+        if on_frame is not None:
+            on_frame(index)
+        if not running:
+            return index
+    return len(recording.frames)
@@ -0,0 +1,51 @@
+# game4/systems/skill_registry.py
+from ..entities.buff import Buff
+from ..entities.skill import Skill, SKILL_DEFINITIONS, TARGET_ENEMY
+
+
+def compile_skill(skill: Skill):
+    """把技能定义编译成 use(battle) -> bool，返回是否成功释放"""
+
+    def use(battle):
+        if not battle.player.use_energy(skill.cost):
+            battle.add_log("技力不足!")
+            return False
+        battle.add_log(f"使用了{skill.name}!")
+
+        if skill.target == TARGET_ENEMY:
+            target = battle.current_monster
+            if target is None:
+                return True
+        else:
+            target = battle.player
+
+        for _ in range(skill.hits):
+            if not battle.current_monster or not battle.current_monster.is_alive():
+                break
+            battle.player_attack(skill.hit_suffix)
+
+        if skill.target == TARGET_ENEMY and not target.is_alive():
+            return True  # 目标已被击败，不再施加效果
+
+        if skill.buff is not None:
+            buff_type, value, duration = skill.buff
+            if callable(value):
+                value = value(battle.player)
+            target.add_buff(Buff(buff_type, value, duration))
+            battle.record("buff", battle.player, target, value)
+            if skill.buff_log:
+                target_name = target.type.value if target is not battle.player else "你"
+                battle.add_log(skill.buff_log.format(target=target_name, value=value))
+        return True
+
+    return use
+
+
+# 启动时编译一次：SkillType -> Skill / 释放函数
+SKILLS = {skill_type: Skill(skill_type) for skill_type in SKILL_DEFINITIONS}
+SKILL_ORDER = list(SKILLS)
+SKILL_HANDLERS = {skill_type: compile_skill(skill) for skill_type, skill in SKILLS.items()}
+
+
+def use_skill(battle, skill_type):
+    return SKILL_HANDLERS[skill_type](battle)
@@ -0,0 +1,157 @@
+# game4/systems/tilemap.py
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+import pygame
+
+from ..constants import GRID_SIZE, GRASS_GREEN, WHITE, WALL_COLOR, CHUNK_SIZE, MAX_CACHED_CHUNKS
+
+
+class Camera:
+    """跟随玩家的摄像机，x/y 为视口左上角的世界坐标（像素）。
+
+    地图比视口小时固定在 (0, 0)，否则以玩家所在格子为中心并限制在地图范围内。
+    """
+
+    def __init__(self, view_width, view_height, world_width, world_height):
+        self.view_width = view_width
+        self.view_height = view_height
+        self.world_width = world_width
+        self.world_height = world_height
+        self.x = 0
+        self.y = 0
+
+    @property
+    def rect(self):
+        return pygame.Rect(self.x, self.y, self.view_width, self.view_height)
+
+    def follow(self, cell_x, cell_y) -> bool:
+        """让视口跟随指定格子，返回视口是否移动"""
+        x = self._clamp(cell_x * GRID_SIZE + GRID_SIZE // 2 - self.view_width // 2, self.world_width - self.view_width)
+        y = self._clamp(cell_y * GRID_SIZE + GRID_SIZE // 2 - self.view_height // 2, self.world_height - self.view_height)
+        moved = (x, y) != (self.x, self.y)
+        self.x, self.y = x, y
+        return moved
+
+    @staticmethod
+    def _clamp(value, upper):
+        return max(0, min(value, upper)) if upper > 0 else 0
+
+    def to_screen(self, world_x, world_y):
+        return world_x - self.x, world_y - self.y
+
+    def cell_rect(self, cell_x, cell_y):
+        """格子在屏幕上的矩形"""
+        return pygame.Rect(cell_x * GRID_SIZE - self.x, cell_y * GRID_SIZE - self.y, GRID_SIZE, GRID_SIZE)
+
+    def visible_cells(self):
+        """视口覆盖的格子范围 (x0, y0, x1, y1)，右下边界不包含"""
+        x0 = self.x // GRID_SIZE
+        y0 = self.y // GRID_SIZE
+        x1 = -(-(self.x + self.view_width) // GRID_SIZE)
+        y1 = -(-(self.y + self.view_height) // GRID_SIZE)
+        return x0, y0, x1, y1
+
+
+class ChunkedTilemap:
+    """分块缓存的地图背景。
+
+    地图按 chunk_size×chunk_size 个格子分块，每块第一次进入视口时才绘制
+    成独立的 Surface（草地、网格线、墙、特殊格子），放进 LRU 缓存；缓存超过
+    max_chunks 块时淘汰最久未显示的块，内存占用与地图大小无关。
+    特殊格子（入口、出口）改变时只让所在的块失效。
+    """
+
+    def __init__(self, width, height, chunk_size=CHUNK_SIZE, max_chunks=MAX_CACHED_CHUNKS):
+        self.width = width
+        self.height = height
+        self.chunk_size = chunk_size
+        self.max_chunks = max_chunks
+        self.chunks: "OrderedDict[Tuple[int, int], pygame.Surface]" = OrderedDict()
+        self.tiles: Dict[Tuple[int, int], Dict[Tuple[int, int], tuple]] = {}  # 块 -> {格子: 颜色}
+        self.walls = frozenset()
+        self.chunk_builds = 0
+
+    def chunk_of(self, x, y):
+        return x // self.chunk_size, y // self.chunk_size
+
+    def set_tile(self, cell, color):
+        """设置特殊格子的颜色，只让它所在的块失效"""
+        key = self.chunk_of(*cell)
+        tiles = self.tiles.setdefault(key, {})
+        if tiles.get(cell) != color:
+            tiles[cell] = color
+            self.chunks.pop(key, None)
+
+    def clear_tile(self, cell):
+        key = self.chunk_of(*cell)
+        if self.tiles.get(key, {}).pop(cell, None) is not None:
+            self.chunks.pop(key, None)
+
+    def set_walls(self, walls):
+        """设置画成墙的格子（整层的布局，所有块失效）"""
+        self.walls = walls
+        self.chunks.clear()
+
+    def clear(self):
+        self.chunks.clear()
+        self.tiles.clear()
+        self.walls = frozenset()
+
+    def get_chunk(self, cx, cy) -> pygame.Surface:
+        key = (cx, cy)
+        chunk = self.chunks.get(key)
+        if chunk is not None:
+            self.chunks.move_to_end(key)
+            return chunk
+
+        chunk = self.render_chunk(cx, cy)
+        self.chunks[key] = chunk
+        if len(self.chunks) > self.max_chunks:
+            self.chunks.popitem(last=False)
+        return chunk
+
+    def render_chunk(self, cx, cy):
+        x0, y0 = cx * self.chunk_size, cy * self.chunk_size
+        cols = min(self.chunk_size, self.width - x0)
+        rows = min(self.chunk_size, self.height - y0)
+        chunk = pygame.Surface((cols * GRID_SIZE, rows * GRID_SIZE)).convert()
+        chunk.fill(GRASS_GREEN)  # 使用草绿色填充背景
+
+        # 绘制地图网格
+        for x in range(cols):
+            for y in range(rows):
+                pygame.draw.rect(chunk, WHITE, (x * GRID_SIZE, y * GRID_SIZE, GRID_SIZE, GRID_SIZE), 1)
+
+        # 绘制墙
+        walls = self.walls
+        for x in range(cols):
+            for y in range(rows):
+                if (x0 + x, y0 + y) in walls:
+                    pygame.draw.rect(chunk, WALL_COLOR, (x * GRID_SIZE, y * GRID_SIZE, GRID_SIZE, GRID_SIZE))
+
+        # 绘制特殊格子
+        for (x, y), color in self.tiles.get((cx, cy), {}).items():
+            pygame.draw.rect(chunk, color, ((x - x0) * GRID_SIZE, (y - y0) * GRID_SIZE, GRID_SIZE, GRID_SIZE))
+
+        self.chunk_builds += 1
+        return chunk
+
+    def draw(self, surface, camera: Camera, area=None):
+        """把与 area（屏幕坐标，默认整个视口）相交的块画到 surface 上，返回绘制次数"""
+        if area is None:
+            area = pygame.Rect(0, 0, camera.view_width, camera.view_height)
+        world = area.move(camera.x, camera.y).clip(pygame.Rect(0, 0, self.width * GRID_SIZE, self.height * GRID_SIZE))
+        if not world.width or not world.height:
+            return 0
+
+        span = self.chunk_size * GRID_SIZE
+        blits = 0
+        for cy in range(world.top // span, (world.bottom - 1) // span + 1):
+            for cx in range(world.left // span, (world.right - 1) // span + 1):
+                chunk = self.get_chunk(cx, cy)
+                chunk_rect = chunk.get_rect(topleft=(cx * span, cy * span))
+                part = world.clip(chunk_rect)
+                surface.blit(chunk, camera.to_screen(part.x, part.y), part.move(-chunk_rect.x, -chunk_rect.y))
+                blits += 1
+        return blits
@@ -0,0 +1,48 @@
+# game4/utils/content.py
+import json
+import os
+from functools import lru_cache
+from types import MappingProxyType
+
+from ..enums import MonsterType, EquipmentType
+
+CONTENT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "content.json")
+
+
+def _freeze(value):
+    """把 JSON 数据转换成只读结构：dict -> MappingProxyType，list -> tuple"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def load_content(path=CONTENT_PATH):
+    """读取怪物和装备定义文件，键为枚举成员名"""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    monsters = {MonsterType[name]: _freeze(row) for name, row in data["monsters"].items()}
+    equipment = {EquipmentType[name]: _freeze(row) for name, row in data["equipment"].items()}
+    return MappingProxyType(monsters), MappingProxyType(equipment)
+
+
+# 启动时加载一次的只读定义表
+MONSTER_DEFINITIONS, EQUIPMENT_DEFINITIONS = load_content()
+
+
+@lru_cache(maxsize=1024)
+def monster_row(monster_type: MonsterType, floor: int):
+    """某层某类怪物的属性行：(图片, 尺寸, 攻击, 体力, 防御)"""
+    row = MONSTER_DEFINITIONS[monster_type]
+    return row["image"], row["size"], row["attack"] * floor, row["health"] * floor, row["defense"] * floor
+
+
+@lru_cache(maxsize=1024)
+def equipment_name(part: EquipmentType, floor: int) -> str:
+    return EQUIPMENT_DEFINITIONS[part]["name"].format(floor=floor)
+
+
+def equipment_options(part: EquipmentType):
+    """装备可能的属性组合，每个组合是 {属性: (最小倍数, 最大倍数)}"""
+    return EQUIPMENT_DEFINITIONS[part]["options"]
@@ -0,0 +1,64 @@
+# game4/utils/dirty_rects.py
+from typing import Dict, Hashable, List, Tuple
+
+import pygame
+
+
+class DirtyRectTracker:
+    """脏矩形跟踪器：记录每帧发生变化的屏幕区域，只把这些区域提交给显示器。
+
+    每个精灵用 key 登记它本帧占用的矩形和外观签名（位置、血量、文字等），
+    签名或矩形变化时新旧两个区域都会被标脏；怪物血条和状态栏的血量、文字
+    也在签名里，diff_sprites 是标脏的唯一入口。状态切换或背景重建后
+    需要调用 request_full_redraw，下一帧退回整屏 flip。
+    """
+
+    def __init__(self):
+        self.rects: List[pygame.Rect] = []
+        self.full_redraw = True
+        self.last_state = None
+        self.sprites: Dict[Hashable, Tuple[pygame.Rect, tuple]] = {}
+
+    def request_full_redraw(self):
+        self.full_redraw = True
+        self.sprites.clear()
+
+    def check_state(self, state):
+        """游戏状态变化时强制整屏刷新"""
+        if state != self.last_state:
+            self.last_state = state
+            self.request_full_redraw()
+
+    def diff_sprites(self, sprites) -> List[pygame.Rect]:
+        """比较本帧精灵与上一帧，返回需要重绘的区域（新旧区域都包含）
+
+        sprites: [(key, rect, signature), ...]
+        """
+        dirty = []
+        previous = self.sprites
+        current = {}
+        for key, rect, signature in sprites:
+            current[key] = (rect, signature)
+            old = previous.pop(key, None)
+            if old is None:
+                dirty.append(rect)
+            elif old[1] != signature or old[0] != rect:
+                dirty.append(old[0])
+                dirty.append(rect)
+
+        # 本帧消失的精灵（例如被击败的怪物）
+        for old_rect, _ in previous.values():
+            dirty.append(old_rect)
+
+        self.sprites = current
+        self.rects.extend(dirty)
+        return dirty
+
+    def present(self):
+        """提交本帧：整屏 flip 或只更新脏矩形"""
+        if self.full_redraw:
+            pygame.display.flip()
+            self.full_redraw = False
+        elif self.rects:
+            pygame.display.update(self.rects)
+        self.rects = []
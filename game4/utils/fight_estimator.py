@@ -0,0 +1,156 @@
+# game4/utils/fight_estimator.py
+"""单场战斗结果的 NumPy 闭式估计，用于画难度热力图。
+
+游戏本身不导入这个模块，numpy 只是工具脚本的依赖。
+
+战斗规则与 BattleEngine 一致（玩家对一只怪物，只用普通攻击）：
+- 每回合玩家先攻击，怪物受到 max(1, max(1, 攻击 - 防御) - 防御) 点伤害；
+  calculate_damage 和 take_damage 各扣一次防御，这里照样保留。
+- 玩家回合结束时结算玩家的恢复效果，怪物回合开始时结算怪物的割裂，
+  割裂每跳同样经过 take_damage，实际伤害为 max(1, 数值 - 防御)。
+- 怪物还活着就反击，伤害同样扣两次防御。
+
+所有输入都可以是标量或数组，按 NumPy 规则广播，一次调用算完整张网格。
+回合数和损失都是整数闭式运算，与战斗长短无关；只有逃跑的几何级数
+按项累加，项数只取决于逃跑成功率。
+
+割裂只在第一击时施加一次（对应开局用割裂，之后普通攻击）；
+恢复效果是开战时已有的 Buff，按上限截断。
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from ..constants import ESCAPE_SUCCESS_RATE
+from ..entities.skill import SKILL_DEFINITIONS
+from ..enums import MonsterType, SkillType
+from .content import MONSTER_DEFINITIONS
+
+# 怪物类型的数组编码：MONSTER_TYPES[i] 对应编码 i
+MONSTER_TYPES = tuple(MonsterType)
+MONSTER_BASE_STATS = np.array([[MONSTER_DEFINITIONS[t]["attack"], MONSTER_DEFINITIONS[t]["health"],
+                                MONSTER_DEFINITIONS[t]["defense"]] for t in MONSTER_TYPES], dtype=np.int64)
+
+# 割裂来自技能表：(每跳数值, 跳数)
+_, BLEED_VALUE, BLEED_TURNS = SKILL_DEFINITIONS[SkillType.BLEED_ATTACK]["buff"]
+
+# win/escape/death 为概率，三者之和为 1；hp_loss 和 turns 为期望值
+FightEstimate = namedtuple("FightEstimate", ["win", "escape", "death", "hp_loss", "turns"])
+
+
+def hit_damage(attack, defense):
+    """一次攻击的实际伤害：先 calculate_damage，再 take_damage，防御扣两次"""
+    return np.maximum(1, np.maximum(1, attack - defense) - defense)
+
+
+def monster_stats(monster_type, floor):
+    """怪物属性 (攻击, 体力, 防御)，与 monster_row 相同：基础值乘以楼层。
+
+    monster_type 为 MONSTER_TYPES 中的编码（整数或整数数组）。
+    """
+    base = MONSTER_BASE_STATS[np.asarray(monster_type)]
+    floor = np.asarray(floor)
+    return base[..., 0] * floor, base[..., 1] * floor, base[..., 2] * floor
+
+
+def rounds_to_reach(total, per_round, bonus=0, window=0):
+    """累计量 t * per_round + bonus * min(t, window) 第一次 >= total 时的回合数 t（t >= 1）。
+
+    per_round >= 1；bonus 可以为负（例如恢复抵消伤害），窗口内每回合净值不为正时
+    直接按窗口之后的速度计算。
+    """
+    total, per_round, bonus, window = np.broadcast_arrays(*(np.asarray(v, dtype=np.int64)
+                                                           for v in (total, per_round, bonus, window)))
+    in_window_rate = per_round + bonus
+    with np.errstate(divide="ignore", invalid="ignore"):
+        early = -(-total // np.where(in_window_rate > 0, in_window_rate, 1))
+    late = -(-(total - bonus * window) // per_round)
+    rounds = np.where((in_window_rate > 0) & (early <= window), early, late)
+    return np.maximum(rounds, 1)
+
+
+def _missing_health(hits, missing, monster_hit, regen, regen_turns):
+    """挨完第 hits 次打后损失的体力（相对上限）。
+
+    第 i 回合先跳恢复（i <= regen_turns）再挨打；恢复不超过上限，即
+    m <- max(0, m - regen)，m <- m + monster_hit。窗口内这个递推的解是
+    max(0, m1 + (i-1) * (monster_hit - regen)) + monster_hit，其中 m1 = max(0, missing - regen)。
+    """
+    first = np.maximum(0, missing - regen)
+    step = monster_hit - regen
+    in_window = np.maximum(0, first + (hits - 1) * step) + monster_hit
+    at_window_end = np.where(regen_turns > 0, np.maximum(0, first + (regen_turns - 1) * step) + monster_hit, missing)
+    after_window = at_window_end + (hits - regen_turns) * monster_hit
+    return np.where(hits <= 0, missing, np.where(hits <= regen_turns, in_window, after_window))
+
+
+def _hits_to_die(max_health, missing, monster_hit, regen, regen_turns):
+    """第几次挨打时体力降到 0（_missing_health 第一次 >= max_health）"""
+    first = np.maximum(0, missing - regen)
+    step = monster_hit - regen
+    # 窗口内：step > 0 时单调增加，否则第一次挨打时损失最大
+    with np.errstate(divide="ignore", invalid="ignore"):
+        growing = 1 + -(-(max_health - monster_hit - first) // np.where(step > 0, step, 1))
+    early = np.where(step > 0, np.maximum(1, growing),
+                     np.where(first + monster_hit >= max_health, 1, np.iinfo(np.int64).max))
+    at_window_end = _missing_health(regen_turns, missing, monster_hit, regen, regen_turns)
+    late = regen_turns + np.maximum(1, -(-(max_health - at_window_end) // monster_hit))
+    return np.where(early <= regen_turns, early, late)
+
+
+def estimate_fight(attack, defense, health, monster_attack, monster_defense, monster_health,
+                   max_health=None, escape=False, bleed=False, regen=0, regen_turns=0,
+                   escape_rate=ESCAPE_SUCCESS_RATE, tolerance=1e-12):
+    """估计一场战斗的结果，返回 FightEstimate（每个字段是广播后形状的数组）。
+
+    attack/defense/health 为玩家总属性和当前体力，max_health 为体力上限（默认等于 health）。
+    bleed 为 True 时第一击用割裂；regen/regen_turns 为开战时已有的恢复效果（每跳数值, 剩余跳数）。
+    escape 为 True 时，打不赢的战斗从第一回合起一直逃跑（每次成功率 escape_rate，
+    失败则挨一次打），打得赢的战斗照常打完；逃跑的期望按几何级数求和，
+    截断到剩余概率小于 tolerance 为止（escape_rate=0.5 时约 40 项）。
+    """
+    health = np.asarray(health, dtype=np.int64)
+    max_health = health if max_health is None else np.asarray(max_health, dtype=np.int64)
+    missing = max_health - health
+    player_hit = hit_damage(np.asarray(attack), np.asarray(monster_defense))
+    monster_hit = hit_damage(np.asarray(monster_attack), np.asarray(defense))
+    bleed_tick = np.where(bleed, np.maximum(1, BLEED_VALUE - np.asarray(monster_defense)), 0)
+    regen = np.asarray(regen, dtype=np.int64)
+    regen_turns = np.asarray(regen_turns, dtype=np.int64)
+
+    # 怪物在第 kill 回合（玩家攻击或怪物回合开始的割裂）倒下，之前反击 kill - 1 次
+    kill = rounds_to_reach(monster_health, player_hit, bleed_tick, BLEED_TURNS)
+    # 玩家在挨第 survive 次打时倒下
+    survive = _hits_to_die(max_health, missing, monster_hit, regen, regen_turns)
+    winnable = kill - 1 < survive
+
+    # 打得赢：挨 kill-1 次打；第 kill 回合玩家回合结束时恢复还会再跳一次
+    fight_missing = _missing_health(kill - 1, missing, monster_hit, regen, regen_turns)
+    fight_missing = np.where(kill <= regen_turns, np.maximum(0, fight_missing - regen), fight_missing)
+    fight_loss = fight_missing - missing
+
+    # 打不赢又逃跑：失败 j 次（j < survive）后成功的概率 q^j * p，连续失败 survive 次阵亡
+    p = float(escape_rate)
+    q = 1.0 - p
+    death_chance = q ** survive
+    flee_loss = death_chance * health
+    flee_turns = survive * death_chance
+    terms = int(np.ceil(np.log(tolerance) / np.log(q))) if 0 < q < 1 else 1
+    for j in range(min(terms, int(np.max(survive, initial=0)))):
+        chance = np.where(j < survive, q ** j * p, 0.0)
+        flee_loss = flee_loss + chance * (_missing_health(j, missing, monster_hit, regen, regen_turns) - missing)
+        flee_turns = flee_turns + chance * (j + 1)
+
+    fleeing = ~winnable & np.asarray(escape)
+    win = winnable.astype(np.float64)
+    death = np.where(winnable, 0.0, np.where(fleeing, death_chance, 1.0))
+    escaped = np.where(fleeing, 1.0 - death_chance, 0.0)
+    hp_loss = np.where(winnable, fight_loss, np.where(fleeing, flee_loss, health)).astype(np.float64)
+    turns = np.where(winnable, kill, np.where(fleeing, flee_turns, survive)).astype(np.float64)
+    return FightEstimate(win, escaped, death, hp_loss, turns)
+
+
+def estimate_grid(attack, defense, health, floor, monster_type, **options):
+    """按 (玩家属性, 楼层, 怪物类型) 估计，怪物属性由 monster_stats 算出；其余参数同 estimate_fight"""
+    monster_attack, monster_health, monster_defense = monster_stats(monster_type, floor)
+    return estimate_fight(attack, defense, health, monster_attack, monster_defense, monster_health, **options)
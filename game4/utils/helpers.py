@@ -9,17 +9,17 @@ from ..entities.equipment import Equipment
 from ..enums import MonsterType, EquipmentType
 
 
-def generate_monsters(floor: int):
+def generate_monsters(floor: int, rng=random):
     """生成指定楼层的怪物"""
     monsters = []
 
     # 生成普通怪物
-    normal_count = random.randint(7, 10)
+    normal_count = rng.randint(7, 10)
     for _ in range(normal_count):
         monsters.append(Monster(MonsterType.NORMAL, floor))
 
     # 生成精英怪物
-    elite_count = random.randint(2, 3)
+    elite_count = rng.randint(2, 3)
     for _ in range(elite_count):
         monsters.append(Monster(MonsterType.ELITE, floor))
 
@@ -29,10 +29,19 @@ def generate_monsters(floor: int):
     return monsters
 
 
-def generate_random_equipment(floor: int) -> Equipment:
+def generate_random_equipment(floor: int, rng=random) -> Equipment:
     """生成随机装备"""
-    part = random.choice(list(EquipmentType))
-    return Equipment(floor, part)
+    part = rng.choice(list(EquipmentType))
+    return Equipment(floor, part, rng)
+
+
+# 战斗胜利后的道具掉落：(道具, 概率)，依次独立判定
+BATTLE_REWARD_DROPS = (("苹果", 0.8), ("葡萄酒", 0.5))
+
+
+def roll_battle_rewards(rng=random):
+    """判定一场战斗掉落的道具，返回道具名列表"""
+    return [item for item, chance in BATTLE_REWARD_DROPS if rng.random() < chance]
 
 
 def calculate_damage(attacker_attack, defender_defense):
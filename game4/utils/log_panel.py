@@ -0,0 +1,58 @@
+# game4/utils/log_panel.py
+import pygame
+
+
+class LogPanel:
+    """预先合成的日志面板。
+
+    面板是一张常驻的 Surface，最新的日志在最上面。有新日志时把已有内容
+    整体向下滚动，只渲染新增的那几行；日志对象更换（新的战斗）或新增
+    行数超过可见行数时才整块重绘。
+    """
+
+    def __init__(self, render_text, size, max_lines=15, line_height=25, padding=10,
+                 background=(0, 0, 0), color=(255, 255, 255)):
+        self.render_text = render_text
+        self.max_lines = max_lines
+        self.line_height = line_height
+        self.padding = padding
+        self.background = background
+        self.color = color
+        self.surface = pygame.Surface(size).convert()
+        self.surface.fill(background)
+        self.log = None
+        self.rendered_total = 0
+
+    def update(self, log):
+        """同步日志（RingBuffer）的新内容，返回面板 Surface"""
+        new_lines = log.total - self.rendered_total
+        if log is not self.log or new_lines >= self.max_lines or new_lines < 0:
+            self.redraw(log)
+        elif new_lines > 0:
+            self.scroll_in(log, new_lines)
+        return self.surface
+
+    def redraw(self, log):
+        self.surface.fill(self.background)
+        for i, entry in enumerate(log.newest(self.max_lines)):
+            self.draw_line(i, entry)
+        self.log = log
+        self.rendered_total = log.total
+
+    def scroll_in(self, log, new_lines):
+        shift = new_lines * self.line_height
+        self.surface.scroll(0, shift)
+
+        width, height = self.surface.get_size()
+        # 清掉顶部空出来的区域和滚出可见行数的旧日志
+        self.surface.fill(self.background, (0, 0, width, self.padding + shift))
+        bottom = self.padding + self.max_lines * self.line_height
+        self.surface.fill(self.background, (0, bottom, width, height - bottom))
+
+        for i, entry in enumerate(log.newest(new_lines)):
+            self.draw_line(i, entry)
+        self.rendered_total = log.total
+
+    def draw_line(self, row, entry):
+        text_surface = self.render_text(entry, True, self.color)
+        self.surface.blit(text_surface, (self.padding, self.padding + row * self.line_height))
@@ -0,0 +1,98 @@
+# game4/utils/perf_monitor.py
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# 帧时间直方图的分桶上限（毫秒），最后一桶为超过 50ms 的帧
+HISTOGRAM_BUCKETS = (8, 16, 33, 50)
+
+
+class PerfMonitor:
+    """逐帧性能统计：各阶段耗时、帧时间历史和本帧计数器。
+
+    GameManager.run 用 phase() 包住 handle_events / update / draw，
+    渲染代码用 count() 记录绘制调用次数。snapshot() 返回最近一帧
+    的完整数据，供性能浮层和测试使用。
+    """
+
+    def __init__(self, history: int = 120, text_cache=None):
+        self.text_cache = text_cache
+        self.frame_times = deque(maxlen=history)  # 每帧实际工作耗时
+        self.intervals = deque(maxlen=history)  # 两帧之间的间隔（即传给 run 的 dt）
+        self.phase_history = {}
+        self.phases = {}
+        self.counters = {}
+        self.last_phases = {}
+        self.last_counters = {}
+        self._frame_start = None
+        self._text_start = (0, 0)
+
+    def begin_frame(self):
+        self._frame_start = time.perf_counter()
+        self.phases = {}
+        self.counters = {}
+        if self.text_cache is not None:
+            self._text_start = (self.text_cache.hits, self.text_cache.misses)
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.phases[name] = self.phases.get(name, 0.0) + elapsed
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def end_frame(self, dt):
+        if self._frame_start is None:
+            return
+        frame_ms = (time.perf_counter() - self._frame_start) * 1000
+        self._frame_start = None
+        self.frame_times.append(frame_ms)
+        self.intervals.append(dt)
+
+        if self.text_cache is not None:
+            hits, misses = self._text_start
+            new_misses = self.text_cache.misses - misses
+            self.counters["text_renders"] = self.text_cache.hits - hits + new_misses
+            self.counters["glyph_renders"] = new_misses
+
+        for name, elapsed in self.phases.items():
+            history = self.phase_history.get(name)
+            if history is None:
+                history = self.phase_history[name] = deque(maxlen=self.frame_times.maxlen)
+            history.append(elapsed)
+
+        self.last_phases = self.phases
+        self.last_counters = self.counters
+
+    def fps(self):
+        if not self.intervals:
+            return 0.0
+        average = sum(self.intervals) / len(self.intervals)
+        return 1000 / average if average > 0 else 0.0
+
+    def histogram(self):
+        """按 HISTOGRAM_BUCKETS 统计历史帧工作耗时的分布"""
+        counts = [0] * (len(HISTOGRAM_BUCKETS) + 1)
+        for frame_ms in self.frame_times:
+            for i, limit in enumerate(HISTOGRAM_BUCKETS):
+                if frame_ms <= limit:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+        return counts
+
+    def snapshot(self):
+        return {
+            "fps": self.fps(),
+            "frame_ms": self.frame_times[-1] if self.frame_times else 0.0,
+            "phases": dict(self.last_phases),
+            "phase_max": {name: max(history) for name, history in self.phase_history.items()},
+            "counters": dict(self.last_counters),
+            "histogram": self.histogram(),
+        }
@@ -0,0 +1,51 @@
+# game4/utils/ring_buffer.py
+
+
+class RingBuffer:
+    """固定容量的环形缓冲区。
+
+    append 为 O(1)，满了以后覆盖最旧的元素。下标 0 是最新的元素，
+    迭代和切片都按从新到旧的顺序，和原来 insert(0, ...) 的列表用法一致。
+    total 记录累计追加过的元素个数，渲染端可以据此只处理新增的部分。
+    """
+
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._items = [None] * capacity
+        self._next = 0  # 下一次写入的位置
+        self._size = 0
+        self.total = 0
+
+    def append(self, item):
+        self._items[self._next] = item
+        self._next = (self._next + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+        self.total += 1
+
+    def clear(self):
+        self._items = [None] * self.capacity
+        self._next = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._size))]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("ring buffer index out of range")
+        return self._items[(self._next - 1 - index) % self.capacity]
+
+    def __iter__(self):
+        for i in range(self._size):
+            yield self._items[(self._next - 1 - i) % self.capacity]
+
+    def newest(self, count: int):
+        """最新的 count 个元素，从新到旧"""
+        return self[:count]
@@ -0,0 +1,35 @@
+# game4/utils/rng.py
+import hashlib
+import random
+from typing import Dict
+
+# 各子系统的随机数流名称
+STREAM_EQUIPMENT = "equipment"
+STREAM_REWARDS = "rewards"
+STREAM_BATTLE = "battle"
+
+
+def derive_seed(*parts) -> int:
+    """由若干部分（本局种子、楼层、流名称……）得到稳定的 64 位种子，不受 Python 哈希随机化影响"""
+    key = ":".join(str(part) for part in parts)
+    digest = hashlib.sha256(key.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+class RNGService:
+    """一局游戏的随机数来源。
+
+    每个子系统按名称取自己的 random.Random 流，种子由 (本局种子, 名称) 推导，
+    各流互不影响：多打一场战斗不会改变之后掉落的装备，同一种子的两局
+    在相同输入下做完全相同的事情。
+    """
+
+    def __init__(self, seed=None):
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.streams: Dict[str, random.Random] = {}
+
+    def stream(self, name) -> random.Random:
+        rng = self.streams.get(name)
+        if rng is None:
+            rng = self.streams[name] = random.Random(derive_seed(self.seed, name))
+        return rng
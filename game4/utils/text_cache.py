@@ -0,0 +1,57 @@
+# game4/utils/text_cache.py
+from collections import OrderedDict
+
+
+class TextCache:
+    """文字 Surface 的 LRU 缓存。
+
+    以 (font, text, antialias, color) 为键缓存 font.render 的结果，
+    超过 max_size 时淘汰最久未使用的条目。中文字形光栅化很慢，
+    状态栏、菜单、战斗日志这类几乎不变的文字每帧都命中缓存。
+    返回的 Surface 被多处共享，调用方只能 blit，不能修改。
+    """
+
+    def __init__(self, max_size: int = 512):
+        self.max_size = max_size
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, antialias, color):
+        key = (font, text, antialias, tuple(color))
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_size:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self._surfaces.clear()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "size": len(self._surfaces),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def __len__(self):
+        return len(self._surfaces)
+
+
+# 所有 game4 渲染代码共享的缓存
+text_cache = TextCache()
@@ -0,0 +1,58 @@
+import random
+
+
+class PlacementError(ValueError):
+    """楼层上放不下更多怪物时抛出"""
+
+
+# 空格子采样器
+class FreeCellSampler:
+    """从空闲格子集合中随机取格子，保证每次放置都能在常数时间内结束。
+
+    - 空闲格子存放在列表里，另有 格子 -> 下标 的字典，删除时与末尾交换后弹出，O(1)
+    - spacing 为两个被取出的格子之间的最小切比雪夫距离：取出一个格子后，
+      把它周围距离小于 spacing 的格子一并移除（spacing=1 只要求不重叠）
+    - exclude 中的格子（入口、出口等）从一开始就不在集合里
+    - 没有空闲格子时抛出 PlacementError，而不是无限循环
+    """
+
+    def __init__(self, cells, spacing=1, exclude=(), rng=random):
+        excluded = set(exclude)
+        self.cells = [cell for cell in cells if cell not in excluded]
+        self.index = {cell: i for i, cell in enumerate(self.cells)}
+        self.spacing = spacing
+        self.rng = rng
+        self.placed = 0
+
+    @classmethod
+    def from_area(cls, x_range, y_range, spacing=1, exclude=(), rng=random):
+        return cls([(x, y) for x in x_range for y in y_range], spacing, exclude, rng)
+
+    def discard(self, cell):
+        i = self.index.pop(cell, None)
+        if i is None:
+            return
+        last = self.cells.pop()
+        if i < len(self.cells):
+            self.cells[i] = last
+            self.index[last] = i
+
+    def reserve(self, cell):
+        """占用一个格子，并移除间距范围内的其他格子"""
+        x, y = cell
+        radius = self.spacing - 1
+        for dx in range(-radius, radius + 1):
+            for dy in range(-radius, radius + 1):
+                self.discard((x + dx, y + dy))
+        self.discard(cell)
+        self.placed += 1
+
+    def sample(self):
+        if not self.cells:
+            raise PlacementError(f"已放置 {self.placed} 个对象后没有空闲格子了（间距 {self.spacing}），请减少数量或增大地图")
+        cell = self.cells[self.rng.randrange(len(self.cells))]
+        self.reserve(cell)
+        return cell
+
+    def __len__(self):
+        return len(self.cells)
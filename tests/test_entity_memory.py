@@ -0,0 +1,57 @@
+"""实体内存占用测试：__slots__ 实体不能带 __dict__，单个实例不超过字节预算。
+
+预算取自加 __slots__ 时在 CPython 3.11（64 位）上测得的 sys.getsizeof，
+有人在 __slots__ 之外赋值、或子类漏写 __slots__ 时这里会失败。
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from game4.entities.buff import Buff, BuffContainer, BuffType  # noqa: E402
+from game4.entities.equipment import Equipment  # noqa: E402
+from game4.entities.item import Item  # noqa: E402
+from game4.entities.monster import Monster  # noqa: E402
+from game4.entities.player import Player  # noqa: E402
+from game4.enums import EquipmentType, ItemType, MonsterType  # noqa: E402
+
+# 每个实例的字节预算（sys.getsizeof，不含引用的对象）
+ENTITIES = [
+    ("Monster", lambda: Monster(MonsterType.NORMAL, 1), 120),
+    ("Equipment", lambda: Equipment(1, EquipmentType.HEAD), 80),
+    ("Item", lambda: Item(ItemType.APPLE), 40),
+    ("Buff", lambda: Buff(BuffType.BLEED, 5, 3), 64),
+    ("BuffContainer", BuffContainer, 64),
+    ("Player", Player, 160),
+]
+
+
+@pytest.mark.parametrize("name, factory, budget", ENTITIES, ids=[entry[0] for entry in ENTITIES])
+def test_entity_has_no_instance_dict(name, factory, budget):
+    obj = factory()
+    assert not hasattr(obj, "__dict__"), f"{name} 实例带有 __dict__，检查 __slots__"
+
+
+@pytest.mark.parametrize("name, factory, budget", ENTITIES, ids=[entry[0] for entry in ENTITIES])
+def test_entity_size_within_budget(name, factory, budget):
+    size = sys.getsizeof(factory())
+    assert size <= budget, f"{name} 每个实例 {size} 字节，超过预算 {budget} 字节"
+
+
+@pytest.mark.parametrize("cls, attribute", [(Item, "name"), (Item, "description"), (Buff, "name")])
+def test_derived_names_are_class_level(cls, attribute):
+    # 名称和描述由类型推导，是类上的 property，不占实例的槽位
+    assert isinstance(cls.__dict__[attribute], property)
+    assert attribute not in cls.__slots__
+
+
+def test_derived_names_resolve_from_class_data():
+    item = Item(ItemType.BREAD)
+    assert item.name == ItemType.BREAD.value
+    assert item.description == Item.DESCRIPTIONS[ItemType.BREAD]
+    assert Buff(BuffType.REGENERATION, 10, 3).name == BuffType.REGENERATION.value
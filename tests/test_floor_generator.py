@@ -0,0 +1,49 @@
+"""楼层生成器测试：地图太小时报错，而不是生成没有怪物、出口一开始就打开的楼层。
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from game4.constants import MAP_COLS, MAP_ROWS  # noqa: E402
+from game4.systems.floor_generator import (  # noqa: E402
+    MIN_MAP_SIZE, FloorCache, FloorGenerationError, generate_floor,
+)
+
+
+@pytest.mark.parametrize("width, height", [(5, 5), (MIN_MAP_SIZE[0] - 1, MIN_MAP_SIZE[1]),
+                                           (MIN_MAP_SIZE[0], MIN_MAP_SIZE[1] - 1)])
+def test_too_small_map_raises(width, height):
+    with pytest.raises(FloorGenerationError):
+        generate_floor(1, 1, width, height)
+
+
+@pytest.mark.parametrize("width, height", [MIN_MAP_SIZE, (MAP_COLS, MAP_ROWS)])
+def test_every_floor_has_all_spawns(width, height):
+    # 每层至少 7 只普通怪、2 只精英和 1 只 Boss
+    for seed in range(200):
+        layout = generate_floor(seed, 1 + seed % 5, width, height)
+        assert len(layout.spawns) >= 10
+        assert all(cell not in layout.walls for _, cell in layout.spawns)
+
+
+def test_same_seed_same_layout():
+    first = generate_floor(42, 3, MAP_COLS, MAP_ROWS)
+    second = generate_floor(42, 3, MAP_COLS, MAP_ROWS)
+    assert first.walls == second.walls and first.spawns == second.spawns
+
+
+
+def test_floor_cache_ready_after_prefetch():
+    cache = FloorCache(1, MAP_COLS, MAP_ROWS)
+    assert not cache.ready(1)
+    cache.prefetch(1)
+    layout = cache.get(1)
+    assert cache.ready(1)
+    assert layout.spawns == generate_floor(1, 1, MAP_COLS, MAP_ROWS).spawns
+    cache.close()